@@ -1,16 +1,49 @@
 <<<<<<< claude/streamlit-app-enhancement-tA64X
 import streamlit as st
 import geopandas as gpd
+import pandas as pd
+import numpy as np
+import shapely
 import folium
-from folium.plugins import MarkerCluster, MeasureControl, Fullscreen, LocateControl
+from folium.elements import JSCSSMixin
+from folium.plugins import MeasureControl, Fullscreen, LocateControl, VectorGridProtobuf
 from streamlit_folium import st_folium
 import requests
 import warnings
-import math
 import json
+import math
+import hashlib
 import io
-from datetime import datetime
-from shapely.geometry import Point
+import os
+import re
+import gzip
+import errno
+import shutil
+import time
+import random
+import threading
+import functools
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from jinja2 import Template
+from pathlib import Path
+from shapely.geometry.polygon import orient
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse, urlencode
+
+try:
+    import mapbox_vector_tile
+    MVT_AVAILABLE = True
+except ImportError:
+    MVT_AVAILABLE = False
+
+try:
+    import topojson
+    TOPOJSON_AVAILABLE = True
+except ImportError:
+    TOPOJSON_AVAILABLE = False
 
 warnings.filterwarnings("ignore")
 
@@ -79,6 +112,229 @@ POINT_NAME_FIELDS = {
     "epa": "PRIMARY_NAME",
 }
 
+# Site Search: attribute fields indexed besides each layer's name field
+# (names weigh SEARCH_NAME_WEIGHT times as much), the most results listed,
+# and how alike (trigram Jaccard) a misspelt word must be to match
+SEARCH_FIELDS = {
+    "deq_bf": ("STATUS", "ADDRESS", "CITY", "COUNTY"),
+    "deq_sf": ("EPA_ID", "STATUS", "CITY", "COUNTY"),
+    "deq_vcp": ("Status", "Address", "City", "County"),
+    "epa": ("REGISTRY_ID", "LOCATION_ADDRESS", "CITY_NAME", "COUNTY_NAME", "POSTAL_CODE"),
+}
+SEARCH_NAME_WEIGHT = 2.0
+SEARCH_LIMIT = 500
+SEARCH_FUZZY_MIN = 0.3
+
+# (fill, border) colours of each point layer's site markers
+POINT_MARKER_COLORS = {
+    "deq_bf": (BRAND["maroon"], BRAND["gold"]),
+    "deq_sf": (BRAND["red"], BRAND["white"]),
+    "deq_vcp": (BRAND["maroon"], BRAND["white"]),
+    "epa": (BRAND["brown"], BRAND["white"]),
+}
+
+# What each layer is fetched with for the app. "fields" is the outFields
+# list (the objectId and edit-date fields are always added): everything the
+# site popups, tooltips and Data Explorer show, or "*" for the small polygon
+# layers whose few rows cost little next to their geometry. "precision" is
+# geometryPrecision in decimal places and "max_offset" is maxAllowableOffset
+# in degrees, i.e. polygons generalised to what is visible around zoom 8-12.
+# The Export tab's raw download bypasses this via load_full_layer().
+LAYER_FETCH_PROFILES = {
+    "cno":     {"fields": ["NAME", "BASENAME", "GEOID"], "precision": 6, "max_offset": 0.0001},
+    "bia":     {"fields": "*", "precision": 5, "max_offset": 0.0003},
+    "usfs":    {"fields": ["FORESTNAME"], "precision": 5, "max_offset": 0.0003},
+    "usace":   {"fields": "*", "precision": 5, "max_offset": 0.0003},
+    "wmas":    {"fields": "*", "precision": 5, "max_offset": 0.0003},
+    "nwrs":    {"fields": ["ORGNAME", "FWSREGION"], "precision": 5, "max_offset": 0.0003},
+    "deq_bf":  {"fields": ["PROJECT_NA", "STATUS", "ADDRESS", "CITY", "COUNTY", "LAT", "LONG"],
+                "precision": 5},
+    "deq_sf":  {"fields": ["NPL_SITE", "EPA_ID", "STATUS", "CITY", "COUNTY", "LATDD3", "LONDD3"],
+                "precision": 5},
+    "deq_vcp": {"fields": ["Facility_N", "Status", "Address", "City", "County", "Lat", "Long"],
+                "precision": 5},
+    "epa":     {"fields": ["PRIMARY_NAME", "REGISTRY_ID", "LOCATION_ADDRESS", "CITY_NAME",
+                           "COUNTY_NAME", "STATE_CODE", "POSTAL_CODE"], "precision": 5},
+}
+
+# Grid (degrees) that normalize_geometries() snaps to when a layer's profile
+# sets no precision; profiles snap to 10**-precision, matching the server
+GEOMETRY_GRID = 1e-6
+
+# compact_dtypes(): text columns with at most this share of distinct values
+# become categoricals; the rest become Arrow-backed strings
+CATEGORY_MAX_RATIO = 0.5
+
+# Where each gis_data layer comes from. "query" layers use arcgis_query();
+# "points" layers build geometry from lat/lon attributes via arcgis_points().
+LAYER_SOURCES = {
+    "cno": {
+        "fetch": "query",
+        "url": "https://tigerweb.geo.census.gov/arcgis/rest/services/TIGERweb/AIANNHA/MapServer/7/query",
+        "where": "BASENAME = 'Choctaw'",
+    },
+    "bia": {
+        "fetch": "query",
+        "url": "https://biamaps.geoplatform.gov/server/rest/services/DivLTR/BIA_AIAN_National_LAR/MapServer/0/query",
+        "where": "LARNAME LIKE '%Choctaw%'",
+    },
+    "usfs": {
+        "fetch": "query",
+        "url": "https://apps.fs.usda.gov/arcx/rest/services/EDW/EDW_ForestSystemBoundaries_01/MapServer/0/query",
+        "where": "FORESTNAME LIKE '%Ouachita%'",
+    },
+    "usace": {
+        "fetch": "query",
+        "url": "https://services2.arcgis.com/FiaPA4ga0iQKduv3/arcgis/rest/services/USACE_Reservoirs/FeatureServer/0/query",
+        "where": "DIST_SYM = 'SWT'",
+    },
+    "wmas": {
+        "fetch": "query",
+        "url": "https://services6.arcgis.com/RBtoEUQ2lmN0K3GY/arcgis/rest/services/OklahomaRecreationalAreas/FeatureServer/0/query",
+    },
+    "nwrs": {
+        "fetch": "query",
+        "url": "https://services.arcgis.com/QVENGdaPbd4LUkLV/arcgis/rest/services/FWSInterest_Simplified_Authoritative/FeatureServer/0/query",
+        "where": "FWSREGION = '2'",
+    },
+    "deq_bf": {
+        "fetch": "points",
+        "url": "https://gis.deq.ok.gov/server/rest/services/LandWeb/MapServer/2/query",
+        "lat_field": "LAT", "lon_field": "LONG",
+    },
+    "deq_sf": {
+        "fetch": "points",
+        "url": "https://gis.deq.ok.gov/server/rest/services/LandWeb/MapServer/1/query",
+        "lat_field": "LATDD3", "lon_field": "LONDD3",
+    },
+    "deq_vcp": {
+        "fetch": "points",
+        "url": "https://gis.deq.ok.gov/server/rest/services/LandWeb/MapServer/0/query",
+        "lat_field": "Lat", "lon_field": "Long",
+    },
+    "epa": {
+        "fetch": "query",
+        "url": "https://services.arcgis.com/cJ9YHowT8TU7DUyn/arcgis/rest/services/Cleanups_in_my_Community_Sites/FeatureServer/0/query",
+        "where": "STATE_CODE = 'OK'",
+    },
+}
+
+# Layers that load_all_data() clips to the CNO boundary after fetching
+CLIPPED_LAYERS = ("wmas", "nwrs", "usace", "deq_bf", "deq_sf", "deq_vcp", "epa")
+
+# Generous lon/lat envelope around the reservation (xmin, ymin, xmax, ymax).
+# Clipped layers send it as a server-side filter so only features near CNO
+# cross the wire; clip() still does the exact refinement locally.
+CNO_ENVELOPE = (-96.95, 33.55, -94.40, 35.50)
+
+# Clipped layers whose polygons are cut at the boundary rather than kept whole
+CLIP_CUT_LAYERS = ()
+
+# Concurrent fetch engine limits (seconds)
+FETCH_WORKERS = 6        # bounded pool shared by all sources
+SOURCE_TIMEOUT = 60      # per source, measured from when its fetch starts
+LOAD_TIMEOUT = 120       # whole fetch_layers() call
+PAGE_WORKERS = 4         # parallel page requests within one arcgis_query()
+PARTIAL_RETRY = 300      # a partial or failed layer is re-fetched after this long
+
+# On-disk layer store shared by every server process (see LayerStore)
+LAYER_CACHE_DIR = Path(os.environ.get("TRTOOL_CACHE_DIR", Path(__file__).resolve().parent / ".layer_cache"))
+LAYER_TTL = 6 * 3600     # default refresh interval for a stored layer
+
+# Per-layer refresh intervals for the background scheduler (seconds).
+# Boundaries and federal land change rarely; site inventories change often.
+REFRESH_INTERVALS = {
+    "cno": 7 * 86400,
+    "usfs": 7 * 86400,
+    "bia": 86400,
+    "usace": 3 * 86400,
+    "wmas": 3 * 86400,
+    "nwrs": 3 * 86400,
+    "deq_bf": 6 * 3600,
+    "deq_sf": 6 * 3600,
+    "deq_vcp": 6 * 3600,
+    "epa": 6 * 3600,
+}
+SCHEDULER_TICK = 60      # how often the scheduler looks for due layers
+
+# Data Explorer paging
+EXPLORER_PAGE_SIZES = (50, 100, 250, 500)
+
+# Per-stage reports carried in a fetched layer's attrs and kept with it by LayerStore
+LAYER_REPORTS = ("normalize", "clip")
+
+# Display simplification for polygon layers: (highest zoom, tolerance in
+# degrees), about half a screen pixel at that zoom. Past the last band the
+# map draws full resolution.
+SIMPLIFY_BANDS = (
+    (8, 0.002),
+    (11, 0.0003),
+    (14, 0.00004),
+)
+MAP_ZOOM = 8            # the map's initial zoom
+MAP_CACHE_BYTES = 256 * 1024 ** 2   # estimated memory for built maps kept by MapCache
+
+# Viewport mode (sidebar opt-in): from VIEWPORT_MIN_ZOOM in, only features
+# near the current view are sent; further out the map shows the
+# band-simplified layers
+VIEWPORT_MIN_ZOOM = 10
+VIEWPORT_PAD = 0.5      # fraction of the view loaded beyond each edge
+
+# Point layers are clustered on the server (PointClusterIndex): sites within
+# about CLUSTER_RADIUS screen pixels of each other are sent as one counted
+# bubble. Past CLUSTER_MAX_ZOOM every site is drawn on its own.
+CLUSTER_RADIUS = 60
+CLUSTER_MAX_ZOOM = 14
+
+# How polygon layers embedded in the map page are encoded: "geojson", or
+# "topojson" (with the topojson package installed) for quantized TopoJSON
+# with shared arcs, decoded in the browser. Coordinates are quantized to the
+# layer's display tolerance, or GEOMETRY_GRID at full resolution, with
+# TOPOJSON_QUANTIZE bounding the grid steps across each layer.
+MAP_ENCODING = os.environ.get("TRTOOL_MAP_ENCODING", "geojson")
+TOPOJSON_QUANTIZE = (1e4, 1e7)
+
+# Map data server: with TRTOOL_TILE_PORT set, the app process serves map
+# layers over HTTP instead of embedding them in the page. The polygon layers
+# in TILE_LAYERS go out as Mapbox Vector Tiles (with mapbox-vector-tile
+# installed) and every other whole or band-simplified layer as a static,
+# content-hashed GeoJSON file under STATIC_DIR. The server only listens on
+# TRTOOL_TILE_HOST (loopback unless set, e.g. to 0.0.0.0 behind a proxy), and
+# TRTOOL_TILE_URL is the address the browser uses for that port when it is
+# not localhost.
+TILE_HOST = os.environ.get("TRTOOL_TILE_HOST", "127.0.0.1")
+TILE_PORT = int(os.environ.get("TRTOOL_TILE_PORT", 0))
+TILE_URL = os.environ.get("TRTOOL_TILE_URL", f"http://localhost:{TILE_PORT}").rstrip("/")
+TILE_LAYERS = ("bia", "usfs", "usace", "wmas", "nwrs")
+TILE_EXTENT = 4096
+TILE_BUFFER = 64          # extent units drawn past each edge, hides seams
+TILE_CACHE_SIZE = 4096    # encoded tiles kept per process
+WEB_MERCATOR_HALF = 20037508.342789244
+STATIC_DIR = LAYER_CACHE_DIR / "static"
+
+# Columns holding esri point x/y in arcgis_query(geojson=False) batches
+ESRI_XY_COLUMNS = ("_esri_x", "_esri_y")
+
+# Last-edit date fields looked for when a layer has no editFieldsInfo
+EDIT_DATE_FIELDS = ("EditDate", "last_edited_date", "lastEditDate", "LAST_EDITED_DATE")
+
+# ArcGIS HTTP layer: per-request timeout and retry policy for transient errors
+HTTP_TIMEOUT = 30
+HTTP_RETRIES = 3                          # attempts after the first
+RETRY_STATUS = (429, 500, 502, 503, 504)
+BACKOFF_BASE = 0.5                        # full jitter up to base * 2**attempt
+BACKOFF_CAP = 8.0
+MAX_GET_QUERY = 1800                      # longer queries are sent as POST
+
+# Per-host circuit breaker: after this many consecutive failed requests the
+# host is skipped for BREAKER_COOLDOWN seconds, then probed with one request
+BREAKER_FAILURES = 3
+BREAKER_COOLDOWN = 300
+
+# Redirect every ArcGIS request to <root>/<host>/<path>, e.g. the local
+# stand-in in tools/mock_arcgis.py; unset talks to the live services
+ARCGIS_ROOT = os.environ.get("TRTOOL_ARCGIS_ROOT", "").rstrip("/")
+
 BASEMAPS = {
     "Light (CartoDB Positron)": "CartoDB positron",
     "Dark (CartoDB Dark Matter)": "CartoDB dark_matter",
@@ -252,13 +508,294 @@ st.markdown(
 # ===================================================================
 # DATA FETCHING
 # ===================================================================
-@st.cache_data(show_spinner=False)
-def arcgis_query(url, where="1=1", out_fields="*", max_page=1000, out_sr=4326, geojson=True):
-    """Paginated ArcGIS REST query returning a GeoDataFrame or None."""
-    all_feats = []
-    offset = 0
+class ArcGISFetchError(Exception):
+    """An ArcGIS request that still failed after retries.
+
+    ``code`` is the HTTP status or ArcGIS error code when there was one.
+    """
+
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.code = code
+
+
+class PartialLayerError(Exception):
+    """Raised by a fetch that lost pages, so it is never stored as complete.
+
+    The incomplete result travels on ``result`` for callers that can use it.
+    """
+
+    def __init__(self, result):
+        super().__init__("layer is missing pages")
+        self.result = result
+
+
+class CircuitBreaker:
+    """Stops calling an agency host that keeps failing.
+
+    "closed" passes every request. BREAKER_FAILURES consecutive failures
+    open it, and requests are then refused without touching the network
+    until BREAKER_COOLDOWN has passed. After that it is "half-open": a single
+    probe goes through, and its outcome closes the breaker or re-opens it
+    for another cool-down.
+    """
+
+    def __init__(self, host, failures=BREAKER_FAILURES, cooldown=BREAKER_COOLDOWN):
+        self.host = host
+        self.threshold = failures
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        return "open" if time.time() - self.opened_at < self.cooldown else "half-open"
+
+    def allow(self):
+        with self.lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def record(self, ok):
+        with self.lock:
+            self.probing = False
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+            else:
+                self.failures += 1
+                if self.failures >= self.threshold:
+                    self.opened_at = time.time()
+
+    def status(self):
+        """{"state", "failures", "retry_at"} for load_status; retry_at is epoch seconds."""
+        with self.lock:
+            retry_at = self.opened_at + self.cooldown if self.opened_at is not None else None
+            return {"state": self.state, "failures": self.failures, "retry_at": retry_at}
+
+
+@st.cache_resource(show_spinner=False)
+def _circuit_breaker(host):
+    """The process-wide breaker for one agency host."""
+    return CircuitBreaker(host)
+
+
+@st.cache_resource(show_spinner=False)
+def _http_session(host):
+    """Keep-alive session with its own connection pool, one per agency host."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=FETCH_WORKERS + PAGE_WORKERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept-Encoding": "gzip, deflate",
+        "User-Agent": "CNO-TRTool/1.0",
+    })
+    return session
+
+
+def _arcgis_get(url, params):
+    """GET an ArcGIS REST endpoint and return its JSON body.
+
+    429/5xx responses, ArcGIS error bodies with those codes and connection
+    failures are retried with full-jitter exponential backoff (honouring
+    Retry-After). Anything else, or running out of retries, raises
+    ArcGISFetchError. While the host's circuit breaker is open the request
+    is refused straight away.
+    """
+    host = urlparse(url).netloc
+    breaker = _circuit_breaker(host)
+    if not breaker.allow():
+        raise ArcGISFetchError(f"{url}: {host} is unavailable (circuit open)")
+    if ARCGIS_ROOT:
+        url = f"{ARCGIS_ROOT}/{host}{urlparse(url).path}"
+    ok = False
+    try:
+        data = _arcgis_request(url, params, breaker)
+        ok = True
+        return data
+    except ArcGISFetchError as e:
+        # A coded error means the host answered; only outages count against it
+        ok = e.code is not None
+        raise
+    finally:
+        breaker.record(ok)
+
+
+def _arcgis_request(url, params, breaker):
+    """The retry loop behind _arcgis_get()."""
+    session = _http_session(urlparse(url).netloc)
+    # Polygon filters can outgrow a GET URL; the query endpoint accepts POST
+    use_post = len(urlencode(params)) > MAX_GET_QUERY
+    error = None
+    for attempt in range(HTTP_RETRIES + 1):
+        retry_after = None
+        try:
+            if use_post:
+                r = session.post(url, data=params, timeout=HTTP_TIMEOUT)
+            else:
+                r = session.get(url, params=params, timeout=HTTP_TIMEOUT)
+            if r.status_code in RETRY_STATUS:
+                error = f"HTTP {r.status_code}"
+                retry_after = r.headers.get("Retry-After")
+            elif r.status_code != 200:
+                raise ArcGISFetchError(f"{url}: HTTP {r.status_code}", code=r.status_code)
+            else:
+                data = r.json()
+                # ArcGIS reports most server faults as a 200 with an error body
+                if "error" not in data:
+                    return data
+                code = data["error"].get("code")
+                error = f"ArcGIS error {code}: {data['error'].get('message', '')}"
+                if code not in RETRY_STATUS:
+                    raise ArcGISFetchError(f"{url}: {error}", code=code)
+        except (requests.RequestException, ValueError) as e:
+            # Dropped connections, timeouts, truncated or undecodable (gzip)
+            # bodies, redirect loops and bad JSON are all treated as transient
+            error = f"{type(e).__name__}: {e}"
+        # Stop early if concurrent requests have already tripped the breaker
+        if attempt == HTTP_RETRIES or breaker.state == "open":
+            break
+        delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+        try:
+            delay = max(delay, min(BACKOFF_CAP, float(retry_after)))
+        except (TypeError, ValueError):
+            pass
+        time.sleep(delay)
+    raise ArcGISFetchError(f"{url}: {error}")
+
+
+def _spatial_filter(geometry):
+    """ArcGIS query params restricting results to features intersecting ``geometry``.
+
+    ``geometry`` is an (xmin, ymin, xmax, ymax) tuple in EPSG:4326 or a
+    shapely (Multi)Polygon such as a simplified CNO boundary; None adds no
+    filter.
+    """
+    if geometry is None:
+        return {}
+    if isinstance(geometry, (tuple, list)):
+        xmin, ymin, xmax, ymax = geometry
+        esri, geom_type = {"xmin": xmin, "ymin": ymin, "xmax": xmax, "ymax": ymax}, "esriGeometryEnvelope"
+    else:
+        polys = getattr(geometry, "geoms", [geometry])
+        rings = []
+        for poly in polys:
+            poly = orient(poly, sign=-1.0)  # Esri rings: outer clockwise, holes counter-clockwise
+            rings.append([[round(x, 5), round(y, 5)] for x, y in poly.exterior.coords])
+            rings.extend([[round(x, 5), round(y, 5)] for x, y in r.coords] for r in poly.interiors)
+        esri, geom_type = {"rings": rings}, "esriGeometryPolygon"
+    esri["spatialReference"] = {"wkid": 4326}
+    return {
+        "geometry": json.dumps(esri, separators=(",", ":")),
+        "geometryType": geom_type,
+        "inSR": 4326,
+        "spatialRel": "esriSpatialRelIntersects",
+    }
+
+
+def _arcgis_ids(url, where="1=1", geometry=None):
+    """Return (objectId field name, sorted objectIds) for a query, or (None, None)."""
+    params = {"where": where, "returnIdsOnly": "true", "f": "json", **_spatial_filter(geometry)}
+    try:
+        data = _arcgis_get(url, params)
+    except ArcGISFetchError:
+        return None, None
+    ids = data.get("objectIds")
+    oid_field = data.get("objectIdFieldName")
+    if ids is None or not oid_field:
+        return None, None
+    return oid_field, sorted(ids)
+
+
+def _feature_batch(feats, geojson):
+    """Turn one page of features into a columnar batch (or None if empty).
+
+    GeoJSON pages become a GeoDataFrame. Esri JSON pages (point layers)
+    become a DataFrame of attributes plus the point x/y in ESRI_XY_COLUMNS.
+    The page's feature dicts can be dropped as soon as this returns.
+    """
+    if not feats:
+        return None
+    if geojson:
+        return gpd.GeoDataFrame.from_features(feats, crs="EPSG:4326")
+    batch = pd.DataFrame.from_records([f.get("attributes") or {} for f in feats])
+    xy = pd.DataFrame.from_records([f.get("geometry") or {} for f in feats], columns=["x", "y"])
+    batch[ESRI_XY_COLUMNS[0]] = xy["x"].to_numpy()
+    batch[ESRI_XY_COLUMNS[1]] = xy["y"].to_numpy()
+    return batch
+
+
+def _fetch_id_chunks(url, object_ids, params, max_page, geojson):
+    """Fetch ``object_ids`` in max_page chunks on a small pool.
+
+    Returns (batches in chunk order, partial) where partial means at least
+    one chunk failed. Long id lists go out as POST via _arcgis_get.
+    """
+    chunks = [object_ids[i:i + max_page] for i in range(0, len(object_ids), max_page)]
+
+    def fetch_chunk(chunk):
+        try:
+            chunk_params = dict(params, objectIds=",".join(str(i) for i in chunk))
+            return _feature_batch(_arcgis_get(url, chunk_params).get("features", []), geojson)
+        except ArcGISFetchError:
+            return False
+
+    batches = []
+    partial = False
+    if chunks:
+        with ThreadPoolExecutor(max_workers=min(PAGE_WORKERS, len(chunks))) as pool:
+            for batch in pool.map(fetch_chunk, chunks):
+                if batch is False:
+                    partial = True
+                elif batch is not None:
+                    batches.append(batch)
+    return batches, partial
+
+
+def arcgis_query(url, where="1=1", out_fields="*", max_page=1000, out_sr=4326, geojson=True, parallel=True,
+                 geometry=None, object_ids=None, precision=None, max_offset=None, listed_ids=None):
+    """Paginated ArcGIS REST query returning a GeoDataFrame or None.
+
+    With ``parallel`` the matching objectIds are requested first so the page
+    count is known up front; the remaining pages are then fetched on a small
+    pool, ordered by objectId and reassembled in offset order. Services that
+    cannot list their ids fall back to the sequential resultOffset loop.
+    ``geometry`` (see _spatial_filter) is applied on the server, and
+    ``object_ids`` restricts the fetch to exactly those features (delta sync).
+    ``listed_ids`` is the caller's _arcgis_ids() result for the same
+    ``where`` and ``geometry``, which saves listing them again. ``precision`` / ``max_offset`` map to geometryPrecision and
+    maxAllowableOffset for generalised geometry.
+
+    Each page is parsed and converted to a columnar batch as it arrives
+    (see _feature_batch), so only one page of raw feature dicts per worker
+    is alive at a time; the batches are concatenated at the end. With
+    ``geojson=False`` the result is the esri point DataFrame arcgis_points
+    builds geometry from.
+
+    None means the query matched nothing. A fetch that fails outright raises
+    ArcGISFetchError and one that loses pages raises PartialLayerError, so
+    neither is stored as if it were complete. Results are not memoised here;
+    LayerStore is the cache, and a refresh must reach the live service.
+    """
     fmt = "geojson" if geojson else "json"
-    while True:
+    generalize = {}
+    if precision is not None:
+        generalize["geometryPrecision"] = precision
+    if max_offset is not None:
+        generalize["maxAllowableOffset"] = max_offset
+
+    def fetch_page(offset, order_by=None):
+        """(feature count, batch, more) for one page; ``more`` is the server's exceededTransferLimit."""
         params = {
             "where": where,
             "outFields": out_fields,
@@ -267,144 +804,1312 @@ def arcgis_query(url, where="1=1", out_fields="*", max_page=1000, out_sr=4326, g
             "resultOffset": offset,
             "resultRecordCount": max_page,
             "returnGeometry": "true",
+            **_spatial_filter(geometry),
+            **generalize,
         }
+        if order_by:
+            params["orderByFields"] = order_by
+        data = _arcgis_get(url, params)
+        more = bool(data.get("exceededTransferLimit") or (data.get("properties") or {}).get("exceededTransferLimit"))
+        batch = _feature_batch(data.get("features", []), geojson)
+        return (0 if batch is None else len(batch)), batch, more
+
+    def fetch_page_safe(offset, order_by=None):
         try:
-            r = requests.get(url, params=params, timeout=30)
-            if r.status_code != 200:
-                break
-            data = r.json()
-            feats = data.get("features", [])
-            if not feats:
-                break
-            all_feats.extend(feats)
-            if len(feats) < max_page:
-                break
-            offset += len(feats)
-        except Exception:
-            break
-    if not all_feats:
+            return fetch_page(offset, order_by)
+        except ArcGISFetchError:
+            return None
+
+    batches = []
+    partial = False
+    if object_ids is not None:
+        params = {"outFields": out_fields, "outSR": out_sr, "f": fmt, "returnGeometry": "true", **generalize}
+        batches, partial = _fetch_id_chunks(url, list(object_ids), params, max_page, geojson)
+        if partial and not batches:
+            raise ArcGISFetchError(f"{url}: no objectId chunk could be fetched")
+    else:
+        oid_field, ids = None, None
+        if parallel:
+            oid_field, ids = listed_ids if listed_ids is not None else _arcgis_ids(url, where, geometry)
+        if ids is not None:
+            total = len(ids)
+            count, first, _ = fetch_page(0, oid_field) if total else (0, None, False)
+            if count:
+                batches.append(first)
+                # The server may cap pages below max_page; step by what it returned
+                offsets = list(range(count, total, count))
+                if offsets:
+                    with ThreadPoolExecutor(max_workers=min(PAGE_WORKERS, len(offsets))) as pool:
+                        for page in pool.map(lambda off: fetch_page_safe(off, oid_field), offsets):
+                            if page is None:
+                                partial = True
+                            elif page[1] is not None:
+                                batches.append(page[1])
+        else:
+            offset = 0
+            while True:
+                page = fetch_page(offset) if offset == 0 else fetch_page_safe(offset)
+                if page is None:
+                    partial = True
+                    break
+                count, batch, more = page
+                if not count:
+                    break
+                batches.append(batch)
+                # A short page is the last one only if the server says nothing was held back
+                if count < max_page and not more:
+                    break
+                offset += count
+    if not batches:
         return None
+    result = pd.concat(batches, ignore_index=True)
+    del batches
     if geojson:
-        return gpd.GeoDataFrame.from_features(
-            {"type": "FeatureCollection", "features": all_feats}, crs="EPSG:4326"
-        )
-    return all_feats
+        result = gpd.GeoDataFrame(result, geometry="geometry", crs="EPSG:4326")
+    if partial:
+        raise PartialLayerError(result)
+    return result
 
 
-@st.cache_data(show_spinner=False)
-def arcgis_points(url, where="1=1", out_fields="*", max_page=1000, lat_field="LAT", lon_field="LONG"):
-    """ArcGIS point query returning a GeoDataFrame from attribute lat/lon."""
-    params = {
-        "where": where,
-        "outFields": out_fields,
-        "outSR": 4326,
-        "f": "json",
-        "resultRecordCount": max_page,
-        "returnGeometry": "true",
+def _coord_column(primary, attrs, candidates):
+    """Vectorised ``a or b or c`` over a coordinate and its attribute fallbacks.
+
+    ``primary`` (geometry x/y) is used where present and non-zero; gaps are
+    filled from each candidate attribute column that exists in the layer.
+    """
+    values = pd.to_numeric(primary, errors="coerce")
+    values = values.where(values != 0)
+    for col in dict.fromkeys(candidates):
+        if col in attrs.columns:
+            fallback = pd.to_numeric(attrs[col], errors="coerce")
+            values = values.fillna(fallback.where(fallback != 0))
+    return values
+
+
+def arcgis_points(url, where="1=1", out_fields="*", max_page=1000, lat_field="LAT", lon_field="LONG",
+                  geometry=None, object_ids=None, precision=None, max_offset=None, listed_ids=None):
+    """ArcGIS point query returning a GeoDataFrame from attribute lat/lon.
+
+    Pages exactly like arcgis_query (which it uses with ``geojson=False``).
+    The lat/lon source columns are resolved once per layer and the points
+    are built in one pass from coordinate arrays. ``geometry`` (see
+    _spatial_filter) is applied on the server, and ``object_ids`` restricts
+    the fetch to exactly those features.
+
+    Raises ArcGISFetchError when the service cannot be reached and
+    PartialLayerError when some pages could not be fetched.
+    """
+    partial = False
+    try:
+        attrs = arcgis_query(url, where=where, out_fields=out_fields, max_page=max_page, geojson=False,
+                             geometry=geometry, object_ids=object_ids, precision=precision, max_offset=max_offset,
+                             listed_ids=listed_ids)
+    except PartialLayerError as e:
+        attrs, partial = e.result, True
+    if attrs is None:
+        return None
+
+    x_col, y_col = ESRI_XY_COLUMNS
+    lat = _coord_column(attrs.pop(y_col), attrs, (lat_field, "Lat", "LATDD3"))
+    lon = _coord_column(attrs.pop(x_col), attrs, (lon_field, "Long", "LONDD3"))
+    valid = (lat.notna() & lon.notna()).to_numpy()
+    if not valid.any():
+        return None
+    result = gpd.GeoDataFrame(
+        attrs[valid].reset_index(drop=True),
+        geometry=gpd.points_from_xy(lon.to_numpy()[valid], lat.to_numpy()[valid]),
+        crs="EPSG:4326",
+    )
+    if partial:
+        raise PartialLayerError(result)
+    return result
+
+
+def _cno_filter_geometry(cno_bounds):
+    """Simplified, slightly padded CNO polygon to send as a server-side filter.
+
+    CNO_ENVELOPE stands in for an empty boundary or one GEOS can't union.
+    """
+    try:
+        boundary = _to_wgs84(cno_bounds).geometry.union_all()
+    except shapely.errors.GEOSException:
+        return CNO_ENVELOPE
+    if boundary is None or boundary.is_empty:
+        return CNO_ENVELOPE
+    return boundary.buffer(0.02).simplify(0.01, preserve_topology=True)
+
+
+def _fetch_source(key, geometry, object_ids=None, full=False, extra_fields=(), listed_ids=None):
+    """Run the LAYER_SOURCES query for ``key``; clipped layers get ``geometry``.
+
+    The layer's LAYER_FETCH_PROFILES entry sets the fields and geometry
+    generalisation unless ``full`` asks for raw data. ``extra_fields`` (the
+    objectId and edit-date fields) are always requested, and ``listed_ids``
+    is passed on to arcgis_query. If the service rejects a profiled field
+    the query is repeated with every field.
+    Profiled results go through normalize_geometries() on the profile's grid.
+    """
+    spec = LAYER_SOURCES[key]
+    profile = {} if full else LAYER_FETCH_PROFILES.get(key, {})
+    fields = profile.get("fields", "*")
+    if fields != "*":
+        fields = ",".join(dict.fromkeys([*fields, *(f for f in extra_fields if f)]))
+    kwargs = {
+        "where": spec.get("where", "1=1"),
+        "out_fields": fields,
+        "precision": profile.get("precision"),
+        "max_offset": profile.get("max_offset"),
     }
+    if key in CLIPPED_LAYERS:
+        kwargs["geometry"] = geometry
+    if object_ids is not None:
+        kwargs["object_ids"] = tuple(object_ids)
+    elif listed_ids is not None:
+        kwargs["listed_ids"] = listed_ids
+    if spec["fetch"] == "points":
+        fetch = functools.partial(arcgis_points, spec["url"], lat_field=spec["lat_field"], lon_field=spec["lon_field"])
+    else:
+        fetch = functools.partial(arcgis_query, spec["url"])
+    grid = 10.0 ** -profile["precision"] if profile.get("precision") else GEOMETRY_GRID
     try:
-        r = requests.get(url, params=params, timeout=30)
-        data = r.json()
-        feats = data.get("features", [])
-        rows = []
-        for f in feats:
-            attrs = f.get("attributes", {})
-            geom = f.get("geometry", {})
-            lat = geom.get("y") or attrs.get(lat_field) or attrs.get("Lat") or attrs.get("LATDD3")
-            lon = geom.get("x") or attrs.get(lon_field) or attrs.get("Long") or attrs.get("LONDD3")
-            if lat is not None and lon is not None:
+        try:
+            gdf = fetch(**kwargs)
+        except ArcGISFetchError as e:
+            if fields == "*" or e.code != 400:
+                raise
+            kwargs["out_fields"] = "*"
+            gdf = fetch(**kwargs)
+    except PartialLayerError as e:
+        if not full:
+            e.result = normalize_geometries(e.result, grid)
+        raise
+    return gdf if full else normalize_geometries(gdf, grid)
+
+
+def _polygonal(geoms):
+    """Polygon parts of each geometry as a MultiPolygon, None where there are none.
+
+    make_valid() can turn a bad ring into a collection that also holds the
+    lines and points it collapsed to; those are not wanted on a polygon layer.
+    """
+    parts, index = shapely.get_parts(geoms, return_index=True)
+    keep = shapely.get_type_id(parts) == 3  # Polygon
+    out = np.full(len(geoms), None, dtype=object)
+    return shapely.multipolygons(parts[keep], indices=index[keep], out=out)
+
+
+def normalize_geometries(gdf, grid=GEOMETRY_GRID):
+    """Repair and lighten the geometry of a freshly fetched layer.
+
+    Invalid geometries are repaired with make_valid (polygons stay
+    polygons), every coordinate is snapped to ``grid`` degrees, which drops
+    the repeated vertices and collapsed rings that snapping leaves behind,
+    and features left empty are removed. The result carries {"repaired",
+    "dropped", "vertices_in", "vertices_out", "seconds"} in
+    ``attrs["normalize"]``; make_valid can add vertices, so vertices_out is
+    not always the smaller.
+    """
+    if gdf is None or gdf.empty:
+        return gdf
+    start = time.perf_counter()
+    geoms = np.asarray(gdf.geometry.values).copy()
+    vertices_in = int(shapely.get_num_coordinates(geoms).sum())
+    invalid = ~shapely.is_valid(geoms) & ~shapely.is_missing(geoms)
+    if invalid.any():
+        repaired = shapely.make_valid(geoms[invalid])
+        was_polygon = np.isin(shapely.get_type_id(geoms[invalid]), (3, 6))
+        collection = shapely.get_type_id(repaired) == 7  # GeometryCollection
+        fix = was_polygon & collection
+        repaired[fix] = _polygonal(repaired[fix])
+        geoms[invalid] = repaired
+    geoms = shapely.set_precision(geoms, grid)
+    keep = ~(shapely.is_missing(geoms) | shapely.is_empty(geoms))
+    out = gdf[keep].set_geometry(gpd.GeoSeries(geoms[keep], index=gdf.index[keep], crs=gdf.crs))
+    out.attrs["normalize"] = {
+        "repaired": int(invalid.sum()),
+        "dropped": int((~keep).sum()),
+        "vertices_in": vertices_in,
+        "vertices_out": int(shapely.get_num_coordinates(geoms[keep]).sum()),
+        "seconds": round(time.perf_counter() - start, 4),
+    }
+    return out
+
+
+def compact_dtypes(gdf):
+    """Store the attribute columns of ``gdf`` in the smallest fitting dtypes.
+
+    Text columns with few distinct values (county names, status codes,
+    STATE_CODE) become categoricals, other text becomes Arrow-backed
+    strings, and integer columns are downcast. Floats keep float64 so
+    coordinates and popups are unchanged. The result carries
+    {"bytes_before", "bytes_after", "categorical", "strings", "downcast",
+    "seconds"} in ``attrs["memory"]``.
+    """
+    if gdf is None or gdf.empty:
+        return gdf
+    start = time.perf_counter()
+    attrs = gdf.drop(columns=gdf.geometry.name)
+    before = int(attrs.memory_usage(deep=True, index=False).sum())
+    converted = {}
+    counts = {"categorical": 0, "strings": 0, "downcast": 0}
+    for col in attrs.columns:
+        series = attrs[col]
+        if pd.api.types.infer_dtype(series, skipna=True) == "string":
+            if series.nunique(dropna=True) <= CATEGORY_MAX_RATIO * len(series):
+                converted[col] = series.astype("category")
+                counts["categorical"] += 1
+            else:
+                converted[col] = series.astype("string[pyarrow]")
+                counts["strings"] += 1
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            smaller = pd.to_numeric(series, downcast="unsigned" if (series >= 0).all() else "integer")
+            if smaller.dtype.itemsize < series.dtype.itemsize:
+                converted[col] = smaller
+                counts["downcast"] += 1
+    out = gdf.assign(**converted) if converted else gdf.copy()
+    after = int(out.drop(columns=out.geometry.name).memory_usage(deep=True, index=False).sum())
+    out.attrs["memory"] = {
+        "bytes_before": before,
+        "bytes_after": after,
+        **counts,
+        "seconds": round(time.perf_counter() - start, 4),
+    }
+    return out
+
+
+@st.cache_data(show_spinner=False)
+def _layer_info(url):
+    """Layer metadata (fields, editFieldsInfo) for a ``.../query`` URL."""
+    return _arcgis_get(url.rsplit("/query", 1)[0], {"f": "json"})
+
+
+def _edit_date_field(url):
+    """Name of the layer's last-edit date field, or None if it has none."""
+    try:
+        info = _layer_info(url)
+    except ArcGISFetchError:
+        return None
+    field = (info.get("editFieldsInfo") or {}).get("editDateField")
+    if field:
+        return field
+    names = {f.get("name") for f in info.get("fields") or []}
+    return next((f for f in EDIT_DATE_FIELDS if f in names), None)
+
+
+def _max_edit(gdf, edit_field):
+    """Latest edit date in ``gdf`` as epoch milliseconds, or None."""
+    if gdf is None or not edit_field or edit_field not in gdf.columns:
+        return None
+    latest = pd.to_numeric(gdf[edit_field], errors="coerce").max()
+    return None if pd.isna(latest) else int(latest)
+
+
+def _to_wgs84(gdf):
+    if gdf.crs is None or gdf.crs.to_epsg() == 4326:
+        return gdf
+    return gdf.to_crs("EPSG:4326")
+
+
+class BoundaryClipper:
+    """The CNO boundary, unioned and prepared once, for clipping many layers.
+
+    ``clip`` drops features whose bounding box misses the boundary's, then
+    runs an STRtree "intersects" query of the survivors against the prepared
+    union. A feature touching several parts of the boundary is still one
+    row, and rows keep their original order.
+    """
+
+    def __init__(self, boundary):
+        self.union = shapely.union_all(np.asarray(_to_wgs84(boundary).geometry.values))
+        shapely.prepare(self.union)
+        self.bounds = self.union.bounds
+
+    def clip(self, gdf, cut=False):
+        """Features of ``gdf`` intersecting the boundary.
+
+        With ``cut``, polygons not wholly inside are replaced by their part
+        inside the boundary. The result carries {"rows_in", "rows_out",
+        "seconds"} in ``attrs["clip"]``.
+        """
+        start = time.perf_counter()
+        gdf = _to_wgs84(gdf)
+        geoms = np.asarray(gdf.geometry.values)
+        xmin, ymin, xmax, ymax = self.bounds
+        b = shapely.bounds(geoms)  # NaN for missing or empty geometries
+        candidates = np.flatnonzero((b[:, 0] <= xmax) & (b[:, 2] >= xmin) & (b[:, 1] <= ymax) & (b[:, 3] >= ymin))
+        hits = shapely.STRtree(geoms[candidates]).query(self.union, predicate="intersects")
+        out = gdf.iloc[candidates[np.sort(hits)]].copy()
+        if cut and len(out):
+            geoms = np.asarray(out.geometry.values)
+            polygonal = np.isin(shapely.get_type_id(geoms), (3, 6))  # Polygon, MultiPolygon
+            edge = polygonal & ~shapely.contains_properly(self.union, geoms)
+            geoms[edge] = shapely.intersection(geoms[edge], self.union)
+            out = out.set_geometry(gpd.GeoSeries(geoms, index=out.index, crs=out.crs))
+            # Polygons that only touched the boundary have nothing left inside it
+            out = out[~edge | (shapely.area(geoms) > 0)]
+        out.attrs["clip"] = {"rows_in": len(gdf), "rows_out": len(out),
+                             "seconds": round(time.perf_counter() - start, 4)}
+        return out
+
+
+def clip_to_cno(gdf, cno_bounds, cut=False):
+    """Keep the features of ``gdf`` that intersect the CNO boundary.
+
+    ``cno_bounds`` is the boundary GeoDataFrame or a BoundaryClipper built
+    from it; pass a clipper when clipping several layers.
+    """
+    if gdf is None or cno_bounds is None:
+        return gdf
+    try:
+        clipper = cno_bounds if isinstance(cno_bounds, BoundaryClipper) else BoundaryClipper(cno_bounds)
+        return clipper.clip(gdf, cut=cut)
+    except Exception:
+        return gdf
+
+
+def fetch_layers(keys=None, cno_bounds=None):
+    """Fetch layers concurrently and clip them to the CNO boundary.
+
+    Sources run on a bounded worker pool. Each source gets SOURCE_TIMEOUT
+    seconds from the moment it starts and the whole call gets LOAD_TIMEOUT;
+    a source that overruns is reported as "failed", exactly like one that
+    raised, and one that lost pages keeps what it got as "partial".
+    Unclipped layers are stored as soon as they arrive, and clipped layers
+    only wait on the CNO boundary at the point they are clipped.
+
+    When "cno" is not among ``keys`` the caller's ``cno_bounds`` is used for
+    clipping, and its simplified outline replaces CNO_ENVELOPE as the
+    server-side filter. When it is, ``cno_bounds`` (the stored boundary) is
+    the fallback if the fresh boundary cannot be fetched. Clipped layers
+    with no boundary at all are kept unclipped but reported "partial", so
+    they never replace a clipped copy. Returns (data, status) dicts keyed by
+    layer; complete layers carry their objectId snapshot in
+    ``attrs["sync"]`` for LayerStore.
+    """
+    keys = list(keys or LAYER_SOURCES)
+    data = {key: None for key in keys}
+    load_status = {key: "failed" for key in keys}
+
+    cno_done = "cno" not in keys
+    awaiting_cno = []  # clipped layers that arrived before the boundary
+    if cno_done and cno_bounds is not None:
+        geometry = _cno_filter_geometry(cno_bounds)
+    else:
+        geometry = CNO_ENVELOPE
+
+    clipper = None
+
+    def store(key, result):
+        nonlocal clipper
+        gdf, status, sync = result
+        # Exact refinement only: clipped sources were already filtered on the server
+        if key in CLIPPED_LAYERS and cno_bounds is None:
+            status, sync = "partial", None  # envelope-filtered only, not clipped
+        elif key in CLIPPED_LAYERS:
+            if clipper is None:
+                clipper = BoundaryClipper(cno_bounds)
+            gdf = clip_to_cno(gdf, clipper, cut=key in CLIP_CUT_LAYERS)
+        data[key] = gdf
+        load_status[key] = status if gdf is not None else "failed"
+        if sync and data[key] is not None:
+            data[key].attrs["sync"] = sync
+
+    started = {}
+
+    def run(key):
+        started[key] = time.monotonic()
+        spec = LAYER_SOURCES[key]
+        # Ids are listed before the fetch, so anything added in between
+        # simply shows up as "added" at the next sync_layer()
+        oid_field, ids = _arcgis_ids(
+            spec["url"], spec.get("where", "1=1"), geometry if key in CLIPPED_LAYERS else None
+        )
+        edit_field = _edit_date_field(spec["url"]) if ids is not None else None
+        try:
+            gdf, status = _fetch_source(key, geometry, extra_fields=(oid_field, edit_field),
+                                        listed_ids=(oid_field, ids)), "ok"
+        except PartialLayerError as e:
+            gdf, status = e.result, "partial"
+        sync = None
+        if status == "ok" and ids is not None and gdf is not None and oid_field in gdf.columns:
+            sync = {"oid_field": oid_field, "ids": ids, "edit_field": edit_field,
+                    "max_edit": _max_edit(gdf, edit_field)}
+        return gdf, status, sync
+
+    deadline = time.monotonic() + LOAD_TIMEOUT
+    pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="gis-fetch")
+    futures = {pool.submit(run, key): key for key in keys}
+    pending = set(futures)
+    try:
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            # Give up on sources that have run past their own limit
+            for fut in list(pending):
+                t0 = started.get(futures[fut])
+                if t0 is not None and now - t0 > SOURCE_TIMEOUT:
+                    pending.discard(fut)
+                    if futures[fut] == "cno":
+                        cno_done = True
+            done, pending = wait(pending, timeout=min(1.0, deadline - now), return_when=FIRST_COMPLETED)
+            for fut in done:
+                key = futures[fut]
                 try:
-                    attrs["geometry"] = Point(float(lon), float(lat))
-                    rows.append(attrs)
-                except (ValueError, TypeError):
-                    continue
-        if not rows:
+                    result = fut.result()
+                except Exception:
+                    result = (None, "failed", None)
+                if key == "cno":
+                    # A failed boundary fetch leaves the stored one in use
+                    if result[0] is not None:
+                        cno_bounds = result[0]
+                    cno_done = True
+                    store(key, result)
+                elif key in CLIPPED_LAYERS and not cno_done:
+                    awaiting_cno.append((key, result))
+                else:
+                    store(key, result)
+            if cno_done:
+                for key, result in awaiting_cno:
+                    store(key, result)
+                awaiting_cno.clear()
+    finally:
+        # Overrunning fetches keep their threads but no longer hold up the page
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    # Boundary never arrived: clip to the stored one, or keep them unclipped as partial
+    for key, result in awaiting_cno:
+        store(key, result)
+
+    return data, load_status
+
+
+def sync_layer(key, store, cno_bounds=None):
+    """Bring a stored layer up to date by fetching only what changed.
+
+    The service's current objectIds, plus its edit-date field where it has
+    one, are compared with the snapshot recorded at the last fetch. Only
+    added or edited features are downloaded and clipped; deleted ones are
+    dropped. Returns the merged GeoDataFrame (with a new ``attrs["sync"]``),
+    or None when the layer needs a full fetch instead.
+    """
+    state = store.sync_state(key)
+    current = store.read(key)
+    if not state or current is None or state["oid_field"] not in current.columns:
+        return None
+    spec = LAYER_SOURCES[key]
+    where = spec.get("where", "1=1")
+    geometry = None
+    if key in CLIPPED_LAYERS:
+        geometry = CNO_ENVELOPE if cno_bounds is None else _cno_filter_geometry(cno_bounds)
+
+    oid_field, ids = _arcgis_ids(spec["url"], where, geometry)
+    if ids is None or oid_field != state["oid_field"]:
+        return None
+    seen, now_ids = set(state["ids"]), set(ids)
+    added, deleted = now_ids - seen, seen - now_ids
+
+    changed = set()
+    edit_field, max_edit = state.get("edit_field"), state.get("max_edit")
+    if edit_field and max_edit is not None:
+        since = datetime.fromtimestamp(max_edit / 1000, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        _, edited = _arcgis_ids(spec["url"], f"({where}) AND {edit_field} > TIMESTAMP '{since}'", geometry)
+        if edited is None:
             return None
-        return gpd.GeoDataFrame(rows, crs="EPSG:4326")
+        changed = set(edited) & seen
+
+    merged = current[~current[oid_field].isin(deleted | changed)]
+    if added or changed:
+        raw = _fetch_source(key, geometry, object_ids=sorted(added | changed),
+                            extra_fields=(oid_field, edit_field))
+        if raw is not None:
+            max_edit = max(filter(None, [max_edit, _max_edit(raw, edit_field)]), default=None)
+            # Only the new rows are clipped; the rest of the layer is already clipped
+            new_rows = raw
+            if key in CLIPPED_LAYERS:
+                new_rows = clip_to_cno(raw, cno_bounds, cut=key in CLIP_CUT_LAYERS)
+            merged = gpd.GeoDataFrame(pd.concat([merged, new_rows], ignore_index=True), crs=current.crs)
+            for report in LAYER_REPORTS:
+                if report in new_rows.attrs:
+                    merged.attrs[report] = new_rows.attrs[report]
+    merged.attrs["sync"] = {"oid_field": oid_field, "ids": sorted(now_ids), "edit_field": edit_field,
+                            "max_edit": max_edit}
+    return merged
+
+
+@st.cache_data(show_spinner=False, ttl=LAYER_TTL, max_entries=4)
+def load_full_layer(key, version):
+    """Raw copy of one layer for export: every field, full-precision geometry.
+
+    Fetched on demand rather than with the app layers, clipped against a
+    full-fidelity boundary, and cached per stored ``version``. Raises
+    ArcGISFetchError / PartialLayerError like the fetchers.
+    """
+    gdf = _fetch_source(key, CNO_ENVELOPE, full=True)
+    if key in CLIPPED_LAYERS:
+        gdf = clip_to_cno(gdf, _fetch_source("cno", None, full=True), cut=key in CLIP_CUT_LAYERS)
+    return gdf
+
+
+def _content_digest(gdf):
+    """Row-order-independent digest of a layer's attributes and geometry, or None."""
+    try:
+        frame = pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+        frame["__wkb__"] = gdf.geometry.to_wkb()
+        rows = np.sort(pd.util.hash_pandas_object(frame, index=False).to_numpy())
     except Exception:
-        return None
+        return None  # unhashable column: treat the layer as changed
+    return hashlib.sha1(rows.tobytes() + "|".join(map(str, frame.columns)).encode()).hexdigest()
 
 
-@st.cache_data(show_spinner=False)
-def load_all_data():
-    """Fetch every data layer, clip to CNO boundary, return dict."""
-    data = {}
-    load_status = {}
+# ===================================================================
+# PERSISTENT LAYER STORE
+# ===================================================================
+class LayerStore:
+    """Disk-backed copy of every clipped layer, keyed like ``gis_data``.
+
+    Each layer is ``<key>.parquet`` (GeoParquet) plus ``<key>.json`` with its
+    fetch time, status, LAYER_REPORTS and a content digest that keeps the
+    version unchanged when a refresh finds the same rows, and ``<key>.sync.json`` with the objectId
+    snapshot for delta sync when the service provides one. Both are written to a temp file and renamed, so a
+    reader never sees half a layer. A failed fetch never replaces a good copy,
+    and a partial one never replaces a complete copy.
+    """
 
-    sources = {
-        "cno": lambda: arcgis_query(
-            "https://tigerweb.geo.census.gov/arcgis/rest/services/TIGERweb/AIANNHA/MapServer/7/query",
-            where="BASENAME = 'Choctaw'",
-        ),
-        "bia": lambda: arcgis_query(
-            "https://biamaps.geoplatform.gov/server/rest/services/DivLTR/BIA_AIAN_National_LAR/MapServer/0/query",
-            where="LARNAME LIKE '%Choctaw%'",
-        ),
-        "usfs": lambda: arcgis_query(
-            "https://apps.fs.usda.gov/arcx/rest/services/EDW/EDW_ForestSystemBoundaries_01/MapServer/0/query",
-            where="FORESTNAME LIKE '%Ouachita%'",
-        ),
-        "usace": lambda: arcgis_query(
-            "https://services2.arcgis.com/FiaPA4ga0iQKduv3/arcgis/rest/services/USACE_Reservoirs/FeatureServer/0/query",
-            where="DIST_SYM = 'SWT'",
-        ),
-        "wmas": lambda: arcgis_query(
-            "https://services6.arcgis.com/RBtoEUQ2lmN0K3GY/arcgis/rest/services/OklahomaRecreationalAreas/FeatureServer/0/query",
-        ),
-        "nwrs": lambda: arcgis_query(
-            "https://services.arcgis.com/QVENGdaPbd4LUkLV/arcgis/rest/services/FWSInterest_Simplified_Authoritative/FeatureServer/0/query",
-            where="FWSREGION = '2'",
-        ),
-        "deq_bf": lambda: arcgis_points(
-            "https://gis.deq.ok.gov/server/rest/services/LandWeb/MapServer/2/query",
-            lat_field="LAT", lon_field="LONG",
-        ),
-        "deq_sf": lambda: arcgis_points(
-            "https://gis.deq.ok.gov/server/rest/services/LandWeb/MapServer/1/query",
-            lat_field="LATDD3", lon_field="LONDD3",
-        ),
-        "deq_vcp": lambda: arcgis_points(
-            "https://gis.deq.ok.gov/server/rest/services/LandWeb/MapServer/0/query",
-            lat_field="Lat", lon_field="Long",
-        ),
-        "epa": lambda: arcgis_query(
-            "https://services.arcgis.com/cJ9YHowT8TU7DUyn/arcgis/rest/services/Cleanups_in_my_Community_Sites/FeatureServer/0/query",
-            where="STATE_CODE = 'OK'",
-        ),
-    }
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.held = {}  # lock name -> Event that stops its heartbeat
 
-    for key, loader in sources.items():
+    def _path(self, key, suffix):
+        return self.root / f"{key}{suffix}"
+
+    def meta(self, key):
+        try:
+            return json.loads(self._path(key, ".json").read_text())
+        except (OSError, ValueError):
+            return None
+
+    def read(self, key):
+        meta = self.meta(key)
+        if not meta or not meta.get("rows"):
+            return None
         try:
-            data[key] = loader()
-            load_status[key] = data[key] is not None
+            return gpd.read_parquet(self._path(key, ".parquet"))
         except Exception:
-            data[key] = None
-            load_status[key] = False
+            return None
 
-    # Spatial clip to CNO boundary
-    cno_bounds = data.get("cno")
+    def _replace(self, key, suffix, write):
+        tmp = self._path(key, f"{suffix}.{os.getpid()}.{threading.get_ident()}.tmp")
+        write(tmp)
+        os.replace(tmp, self._path(key, suffix))
 
-    def clip(gdf):
-        if gdf is None or cno_bounds is None:
-            return gdf
+    def sync_state(self, key):
+        """objectId snapshot written with the layer, used by sync_layer()."""
         try:
-            return (
-                gpd.sjoin(
-                    gdf.to_crs("EPSG:4326"),
-                    cno_bounds[["geometry"]].to_crs("EPSG:4326"),
-                    predicate="intersects",
-                )
-                .drop(columns=["index_right"], errors="ignore")
-            )
+            return json.loads(self._path(key, ".sync.json").read_text())
+        except (OSError, ValueError):
+            return None
+
+    def write(self, key, gdf, status):
+        old = self.meta(key)
+        if old and old.get("rows") and (gdf is None or (status != "ok" and old.get("status") == "ok")):
+            return  # keep the last good copy
+        reports = {}
+        now = time.time()
+        version = f"{now:.3f}"
+        digest = None
+        if gdf is None:
+            rows = 0
+        else:
+            reports = {name: gdf.attrs.pop(name, None) for name in LAYER_REPORTS}
+            sync = gdf.attrs.pop("sync", None)
+            if sync:
+                self._replace(key, ".sync.json", lambda path: path.write_text(json.dumps(sync)))
+            else:
+                # No usable snapshot for this copy; the next refresh is a full fetch
+                self._path(key, ".sync.json").unlink(missing_ok=True)
+            digest = _content_digest(gdf)
+            rows = len(gdf)
+        if digest and old and old.get("digest") == digest and old.get("status") == status:
+            # Same rows as the stored copy: only the freshness changes, so the
+            # version and every cache keyed on it stay valid
+            version = self.version(key)
+            reports = {name: reports[name] or old.get(name) for name in LAYER_REPORTS}
+        elif gdf is not None:
+            try:
+                self._replace(key, ".parquet", gdf.to_parquet)
+            except Exception:
+                # Mixed-type object columns are the usual culprit
+                safe = gdf.copy()
+                for col in safe.columns.drop("geometry"):
+                    if safe[col].dtype == object:
+                        safe[col] = safe[col].astype("string")
+                self._replace(key, ".parquet", safe.to_parquet)
+        meta = {
+            "fetched_at": datetime.now().isoformat(timespec="seconds"),
+            "fetched_ts": now,
+            "version": version,
+            "digest": digest,
+            "status": status,
+            "rows": rows,
+            **reports,
+        }
+        self._replace(key, ".json", lambda path: path.write_text(json.dumps(meta)))
+
+    def version(self, key):
+        """Changes only when the layer's rows do; keys the per-version caches."""
+        meta = self.meta(key) or {}
+        return meta.get("version") or f"{meta.get('fetched_ts', 0):.3f}"
+
+    def is_fresh(self, key):
+        """Complete layers stay fresh for their REFRESH_INTERVALS entry.
+
+        Partial or failed ones are due again after PARTIAL_RETRY.
+        """
+        meta = self.meta(key)
+        if meta is None:
+            return False
+        ttl = REFRESH_INTERVALS.get(key, LAYER_TTL) if meta.get("status") == "ok" else PARTIAL_RETRY
+        return time.time() - meta.get("fetched_ts", 0) < ttl
+
+    def try_lock(self, name, expires):
+        """Take a lock shared by every process using this store; False if held.
+
+        A lock older than ``expires`` seconds is assumed abandoned and broken,
+        so while this process holds it a heartbeat thread renews its mtime
+        every third of ``expires``, however long the work under it takes.
+        """
+        path = self._path(name, ".lock")
+        try:
+            if time.time() - path.stat().st_mtime > expires:
+                path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            return False
+        stop = self.held[name] = threading.Event()
+
+        def heartbeat():
+            while not stop.wait(expires / 3):
+                try:
+                    os.utime(path)
+                except OSError:
+                    return
+        threading.Thread(target=heartbeat, name=f"{name}-lock", daemon=True).start()
+        return True
+
+    def unlock(self, name):
+        stop = self.held.pop(name, None)
+        if stop is not None:
+            stop.set()
+        self._path(name, ".lock").unlink(missing_ok=True)
+
+
+@st.cache_resource(show_spinner=False)
+def _layer_store():
+    return LayerStore(LAYER_CACHE_DIR)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _read_layer(key, version):
+    """Stored layer as of ``version`` (its fetch timestamp), read once per process.
+
+    Attribute columns are compacted with compact_dtypes().
+    """
+    return compact_dtypes(_layer_store().read(key))
+
+
+def display_tolerance(zoom):
+    """SIMPLIFY_BANDS tolerance for a map zoom level, or None for full resolution."""
+    return next((tol for max_zoom, tol in SIMPLIFY_BANDS if zoom <= max_zoom), None)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def simplified_layer(key, version, tolerance):
+    """Stored polygon layer simplified to ``tolerance`` degrees for display.
+
+    Computed once per data ``version`` and zoom band. A layer whose polygons
+    form a clean coverage (no overlaps) is simplified as a coverage, so
+    neighbouring parcels keep their shared edges; otherwise each polygon is
+    simplified on its own with topology preserved.
+    """
+    gdf = _read_layer(key, version)
+    if gdf is None or gdf.empty:
+        return gdf
+    geoms = np.asarray(gdf.geometry.values)
+    simplified = None
+    if hasattr(shapely, "coverage_simplify"):
+        try:
+            if shapely.coverage_is_valid(geoms):
+                simplified = shapely.coverage_simplify(geoms, tolerance)
+        except Exception:
+            pass  # GEOS older than 3.12
+    if simplified is None:
+        simplified = shapely.simplify(geoms, tolerance, preserve_topology=True)
+    return gdf.set_geometry(gpd.GeoSeries(simplified, index=gdf.index, crs=gdf.crs))
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _layer_index(key, version, tolerance):
+    """(frame, STRtree) of ``key`` as drawn at ``tolerance``, built once per version and band."""
+    gdf = _read_layer(key, version) if tolerance is None else simplified_layer(key, version, tolerance)
+    if gdf is None or gdf.empty:
+        return None, None
+    return gdf, shapely.STRtree(np.asarray(gdf.geometry.values))
+
+
+def features_in_view(key, version, tolerance, window):
+    """Features of ``key`` whose bounding box meets ``window`` (xmin, ymin, xmax, ymax)."""
+    gdf, tree = _layer_index(key, version, tolerance)
+    if gdf is None:
+        return None
+    return gdf.iloc[np.sort(tree.query(shapely.box(*window)))]
+
+
+def viewport_window(bounds, zoom, loaded=None):
+    """Area to load for the map view ``bounds`` (st_folium's dict) at ``zoom``.
+
+    The view is padded by VIEWPORT_PAD on each side and snapped to a grid
+    that scales with zoom, and the window already ``loaded`` is kept while
+    the view stays inside it and is not much smaller. Small pans therefore
+    map to the same window, which reuses the cached map instead of
+    rebuilding and remounting it. Returns None when ``bounds`` is unusable.
+    """
+    try:
+        xmin, ymin = bounds["_southWest"]["lng"], bounds["_southWest"]["lat"]
+        xmax, ymax = bounds["_northEast"]["lng"], bounds["_northEast"]["lat"]
+        width, height = xmax - xmin, ymax - ymin
+    except (KeyError, TypeError):
+        return None
+    if not width > 0 or not height > 0:
+        return None
+    if loaded is not None:
+        lx0, ly0, lx1, ly1 = loaded
+        inside = lx0 <= xmin and ly0 <= ymin and xmax <= lx1 and ymax <= ly1
+        if inside and (lx1 - lx0) * (ly1 - ly0) <= 16 * width * height:
+            return loaded
+    step = 360 / 2 ** zoom  # one 256 px tile at this zoom
+    return (
+        math.floor((xmin - width * VIEWPORT_PAD) / step) * step,
+        math.floor((ymin - height * VIEWPORT_PAD) / step) * step,
+        math.ceil((xmax + width * VIEWPORT_PAD) / step) * step,
+        math.ceil((ymax + height * VIEWPORT_PAD) / step) * step,
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def attribute_table(key, version):
+    """Stored layer without its geometry, shared read-only by every session.
+
+    Cached as a resource so reruns reuse one frame instead of copying it.
+    """
+    gdf = _read_layer(key, version)
+    if gdf is None:
+        return None
+    return pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def attribute_rows(key, version, query="", sort_col=None, descending=False):
+    """Row positions of attribute_table() matching ``query``, in ``sort_col`` order.
+
+    ``query`` is matched case-insensitively as a substring of any column.
+    Object columns sort as text, since they can mix strings and numbers.
+    Missing values sort last either way.
+    """
+    table = attribute_table(key, version)
+    positions = np.arange(len(table))
+    if query:
+        mask = np.zeros(len(table), dtype=bool)
+        for col in table.columns:
+            mask |= table[col].astype("string").str.contains(query, case=False, regex=False, na=False).to_numpy()
+        positions = positions[mask]
+    if sort_col in table.columns:
+        values = table[sort_col].iloc[positions].reset_index(drop=True)
+        if values.dtype == object:
+            values = values.astype("string")
+        order = values.sort_values(ascending=not descending, na_position="last", kind="stable").index
+        positions = positions[order.to_numpy()]
+    return positions
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def attribute_stats(key, version):
+    """describe() of the numeric columns of attribute_table(), or None if there are none."""
+    numeric = attribute_table(key, version).select_dtypes(include=["number"])
+    return None if numeric.empty else numeric.describe().T
+
+
+def encode_topojson(gdf, tolerance):
+    """``gdf``'s geometry as a quantized TopoJSON string, one object named "data".
+
+    TopoJsonLayer draws every feature with one style and no popup, so the
+    attribute columns are left out. Borders shared by neighbouring polygons
+    are stored once as arcs, and coordinates become integer deltas on a grid
+    of about ``tolerance`` (or GEOMETRY_GRID) degrees, within the
+    TOPOJSON_QUANTIZE step bounds.
+    """
+    xmin, ymin, xmax, ymax = gdf.total_bounds
+    span = max(xmax - xmin, ymax - ymin, GEOMETRY_GRID)
+    low, high = TOPOJSON_QUANTIZE
+    steps = min(max(span / (tolerance or GEOMETRY_GRID), low), high)
+    shapes = gdf[[gdf.geometry.name]].reset_index(drop=True)
+    topo = topojson.Topology(shapes, prequantize=int(steps), object_name="data")
+    return topo.to_json()
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def topojson_layer(key, version, tolerance):
+    """encode_topojson() of the stored layer as drawn at ``tolerance``, once per version and band."""
+    gdf = _read_layer(key, version) if tolerance is None else simplified_layer(key, version, tolerance)
+    if gdf is None or gdf.empty:
+        return None
+    return encode_topojson(gdf, tolerance)
+
+
+class TopoJsonLayer(JSCSSMixin, folium.map.Layer):
+    """Embedded TopoJSON (from encode_topojson) decoded in the browser, drawn with one fixed ``style``."""
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function () {
+                var topo = {{ this.data }};
+                return L.geoJson(topojson.feature(topo, topo.objects.data), {
+                    style: function () { return {{ this.style|tojson }}; }
+                });
+            })();
+        {% endmacro %}""")
+
+    default_js = [
+        ("topojson", "https://cdnjs.cloudflare.com/ajax/libs/topojson/1.6.9/topojson.min.js"),
+    ]
+
+    def __init__(self, data, name=None, style=None, overlay=True, control=True, show=True):
+        super().__init__(name=name, overlay=overlay, control=control, show=show)
+        self._name = "TopoJsonLayer"
+        self.data = data.replace("</", "<\\/")  # keep "</script>" out of the page
+        self.style = style or {}
+
+
+class _LayerRefresher:
+    """Keeps the layer store warm from inside the server process.
+
+    A scheduler thread checks every SCHEDULER_TICK seconds for layers past
+    their REFRESH_INTERVALS entry and refreshes them on a background thread,
+    one refresh at a time across every process sharing the store. Pages are
+    always served from the last completed snapshot on disk.
+
+    Layers with an objectId snapshot are delta-synced; the rest, and every
+    layer when the boundary itself is being refreshed, are fetched in full.
+    When the refreshed boundary differs from the stored one, every clipped
+    layer is fetched again, whether it was due or not.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.lock = threading.Lock()
+        self.running = False
+        self.last_attempt = {}
+
+    def refresh(self, keys):
+        now = time.time()
+        with self.lock:
+            # A source that keeps failing is retried every PARTIAL_RETRY, not every rerun
+            keys = [k for k in keys if now - self.last_attempt.get(k, 0) > PARTIAL_RETRY]
+            if self.running or not keys:
+                return
+            self.running = True
+            for key in keys:
+                self.last_attempt[key] = now
+        threading.Thread(target=self._run, args=(keys,), name="layer-refresh", daemon=True).start()
+
+    def start_schedule(self):
+        threading.Thread(target=self._schedule_loop, name="layer-scheduler", daemon=True).start()
+
+    def _schedule_loop(self):
+        while True:
+            # Sleep first: a cold start is already fetching what is missing
+            time.sleep(SCHEDULER_TICK)
+            try:
+                due = [key for key in LAYER_SOURCES if not self.store.is_fresh(key)]
+                if due:
+                    self.refresh(due)
+            except Exception:
+                pass  # never let one bad tick stop the scheduler
+
+    def _try_sync(self, key, cno_bounds):
+        try:
+            return sync_layer(key, self.store, cno_bounds)
         except Exception:
-            return gdf
+            return None
+
+    def _run(self, keys):
+        # Another worker process is already refreshing this store
+        if not self.store.try_lock("refresh", expires=2 * LOAD_TIMEOUT):
+            with self.lock:
+                self.running = False
+            return
+        try:
+            full = list(keys)
+            # The stored boundary clips deltas, and stands in if a new one fails to fetch
+            cno_bounds = self.store.read("cno")
+            # A new boundary means re-clipping from scratch; otherwise sync deltas
+            if "cno" not in keys:
+                with ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="gis-sync") as pool:
+                    synced = dict(zip(keys, pool.map(lambda k: self._try_sync(k, cno_bounds), keys)))
+                full = [key for key in keys if synced[key] is None]
+                for key, gdf in synced.items():
+                    if gdf is not None:
+                        self.store.write(key, gdf, "ok")
+            if full:
+                boundary = (self.store.meta("cno") or {}).get("digest")
+                data, status = fetch_layers(full, cno_bounds=cno_bounds)
+                for key in full:
+                    self.store.write(key, data[key], status[key])
+                # A changed boundary re-clips every clipped layer, not just those due now
+                if "cno" in full and (self.store.meta("cno") or {}).get("digest") != boundary:
+                    rest = [key for key in CLIPPED_LAYERS if key not in full]
+                    if rest:
+                        data, status = fetch_layers(rest, cno_bounds=self.store.read("cno"))
+                        for key in rest:
+                            self.store.write(key, data[key], status[key])
+        finally:
+            self.store.unlock("refresh")
+            with self.lock:
+                self.running = False
+                # Only layers that are still due keep their retry back-off
+                for key in keys:
+                    if self.store.is_fresh(key):
+                        self.last_attempt.pop(key, None)
+
+
+@st.cache_resource(show_spinner=False)
+def _layer_refresher():
+    """The process-wide refresher; its scheduler starts on first use."""
+    refresher = _LayerRefresher(_layer_store())
+    refresher.start_schedule()
+    return refresher
+
+
+def _fetch_missing(store):
+    """Fetch and store the layers that have no stored copy yet.
+
+    Single-flight across sessions and processes: whoever takes the store's
+    "refresh" lock fetches, everyone else waits for the lock to be released
+    and then finds the layers on disk (or fetches what is still missing).
+    """
+    while True:
+        missing = [key for key in LAYER_SOURCES if store.meta(key) is None]
+        if not missing:
+            return
+        if store.try_lock("refresh", expires=2 * LOAD_TIMEOUT):
+            break
+        time.sleep(0.5)
+    try:
+        # Another session may have filled the store while we waited
+        missing = [key for key in LAYER_SOURCES if store.meta(key) is None]
+        if missing:
+            fetched, status = fetch_layers(missing, cno_bounds=store.read("cno"))
+            for key in missing:
+                store.write(key, fetched[key], status[key])
+    finally:
+        store.unlock("refresh")
+
+
+def load_all_data():
+    """Return (gis_data, load_status), served from the on-disk layer store.
+
+    Layers with no stored copy are fetched before returning. Stored layers
+    are served straight from disk; the background scheduler refreshes each
+    one on its REFRESH_INTERVALS cadence, and a layer found past due is still
+    served while it is refreshed (stale-while-revalidate).
+
+    load_status maps each key to {"status", "stale", "fetched_at",
+    "version", "breaker", "normalize", "clip", "memory"}, where status is
+    "ok", "partial" or "failed" for the fetch that produced the copy being
+    served, breaker is the source host's CircuitBreaker.status(), normalize
+    and clip are the normalize_geometries() and BoundaryClipper reports for
+    that copy (None where the step did not run), and memory is the
+    compact_dtypes() report for the copy in memory. A layer whose host is
+    being skipped is served from its last good copy and marked stale.
+    """
+    store = _layer_store()
+    refresher = _layer_refresher()
+    _fetch_missing(store)
 
-    for key in ["wmas", "nwrs", "usace", "deq_bf", "deq_sf", "deq_vcp", "epa"]:
-        data[key] = clip(data[key])
+    stale = [key for key in LAYER_SOURCES if not store.is_fresh(key)]
+    if stale:
+        refresher.refresh(stale)
 
+    data = {}
+    load_status = {}
+    for key in LAYER_SOURCES:
+        meta = store.meta(key) or {}
+        version = store.version(key)
+        data[key] = _read_layer(key, version) if meta.get("rows") else None
+        breaker = _circuit_breaker(urlparse(LAYER_SOURCES[key]["url"]).netloc).status()
+        load_status[key] = {
+            "status": meta.get("status", "failed") if data[key] is not None else "failed",
+            "stale": key in stale or breaker["state"] != "closed",
+            "fetched_at": meta.get("fetched_at"),
+            "version": version,
+            "breaker": breaker,
+            **{name: meta.get(name) for name in LAYER_REPORTS},
+            "memory": data[key].attrs.get("memory") if data[key] is not None else None,
+        }
     return data, load_status
 
 
+# ===================================================================
+# MAP DATA SERVER (vector tiles, static GeoJSON)
+# ===================================================================
+def _tile_bounds(z, x, y):
+    """Web Mercator bounds of tile z/x/y."""
+    size = 2 * WEB_MERCATOR_HALF / 2 ** z
+    xmin = -WEB_MERCATOR_HALF + x * size
+    ymax = WEB_MERCATOR_HALF - y * size
+    return xmin, ymax - size, xmin + size, ymax
+
+
+class VectorTileServer:
+    """Mapbox Vector Tiles for stored layers, cut on demand.
+
+    Tiles are read from the LayerStore rather than from a session, so every
+    app process sharing the store serves the same thing. Each layer is
+    projected to Web Mercator and indexed once per version; encoded tiles
+    are kept in an LRU of TILE_CACHE_SIZE, keyed by layer, version and
+    z/x/y. Tile URLs carry the version, so browsers may cache them for good.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.lock = threading.Lock()
+        self.layers = {}  # key -> (version, geometries, properties, STRtree)
+        self.tiles = OrderedDict()
+
+    def _layer(self, key):
+        version = self.store.version(key)
+        with self.lock:
+            cached = self.layers.get(key)
+        if cached and cached[0] == version:
+            return cached
+        gdf = self.store.read(key)
+        if gdf is None:
+            return None
+        gdf = gdf.to_crs("EPSG:3857")
+        geoms = np.asarray(gdf.geometry.values)
+        attrs = gdf.drop(columns=gdf.geometry.name).astype(object)
+        props = attrs.where(attrs.notna(), None).to_dict("records")
+        entry = (version, geoms, props, shapely.STRtree(geoms))
+        with self.lock:
+            self.layers[key] = entry
+        return entry
+
+    def tile(self, key, z, x, y):
+        """Encoded tile bytes for layer ``key``, or None if it has no data."""
+        layer = self._layer(key)
+        if layer is None:
+            return None
+        version, geoms, props, tree = layer
+        cache_key = (key, version, z, x, y)
+        with self.lock:
+            if cache_key in self.tiles:
+                self.tiles.move_to_end(cache_key)
+                return self.tiles[cache_key]
+        bounds = _tile_bounds(z, x, y)
+        unit = (bounds[2] - bounds[0]) / TILE_EXTENT
+        pad = unit * TILE_BUFFER
+        padded = (bounds[0] - pad, bounds[1] - pad, bounds[2] + pad, bounds[3] + pad)
+        hits = np.sort(tree.query(shapely.box(*padded), predicate="intersects"))
+        # Nothing finer than one tile unit survives quantisation anyway
+        cut = shapely.simplify(shapely.clip_by_rect(geoms[hits], *padded), unit, preserve_topology=True)
+        features = [
+            {"geometry": geom, "properties": {k: v for k, v in props[i].items() if v is not None}}
+            for geom, i in zip(cut, hits) if not geom.is_empty
+        ]
+        data = mapbox_vector_tile.encode(
+            [{"name": key, "features": features}],
+            default_options={
+                "quantize_bounds": bounds,
+                "extents": TILE_EXTENT,
+                "on_invalid_geometry": mapbox_vector_tile.encoder.on_invalid_geometry_make_valid,
+            },
+        )
+        with self.lock:
+            self.tiles[cache_key] = data
+            while len(self.tiles) > TILE_CACHE_SIZE:
+                self.tiles.popitem(last=False)
+        return data
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def static_geojson(key, version, tolerance):
+    """Content hash naming the static GeoJSON of ``key`` at ``version`` and ``tolerance``.
+
+    The layer's geometry as the map draws it is written once, gzipped, to
+    STATIC_DIR/<key>/<version>/<hash>.geojson.gz. The hash doubles as the
+    URL and the ETag, so changed data always gets a new URL and browsers can
+    cache each file for good. Writing a file prunes the layer's other
+    versions. None when the layer is empty.
+    """
+    gdf = _read_layer(key, version) if tolerance is None else simplified_layer(key, version, tolerance)
+    if gdf is None or gdf.empty:
+        return None
+    # GeoJsonUrlLayer has one fixed style and no popup: geometry is all it uses
+    body = gdf[[gdf.geometry.name]].to_json(drop_id=True).encode()
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    path = STATIC_DIR / key / version / f"{digest}.geojson.gz"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(gzip.compress(body, compresslevel=6))
+        os.replace(tmp, path)
+        _prune_static(key, {version, _layer_store().version(key)})
+    return digest
+
+
+def _prune_static(key, keep):
+    """Delete the static GeoJSON of every version of ``key`` not in ``keep``."""
+    for old in STATIC_DIR.glob("*.geojson.gz"):
+        old.unlink(missing_ok=True)  # flat files from before per-layer folders
+    for folder in (STATIC_DIR / key).iterdir():
+        if folder.name not in keep:
+            shutil.rmtree(folder, ignore_errors=True)
+
+
+class GeoJsonUrlLayer(folium.map.Layer):
+    """GeoJSON layer the browser fetches from ``url``, drawn with one fixed ``style``.
+
+    Unlike folium.GeoJson(embed=False) the data is not also downloaded here
+    to build a per-feature style table.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = L.geoJson(null, {
+                style: function () { return {{ this.style|tojson }}; }
+            });
+            fetch({{ this.url|tojson }})
+                .then(function (response) { return response.json(); })
+                .then(function (data) { {{ this.get_name() }}.addData(data); });
+        {% endmacro %}""")
+
+    def __init__(self, url, name=None, style=None, overlay=True, control=True, show=True):
+        super().__init__(name=name, overlay=overlay, control=control, show=show)
+        self._name = "GeoJsonUrlLayer"
+        self.url = url
+        self.style = style or {}
+
+
+def _map_data_handler(tiles):
+    pattern = re.compile(r"^/(\w+)/[\d.]+/(\d+)/(\d+)/(\d+)\.pbf$")
+    static = re.compile(r"^/geojson/(\w+)/([\d.]+)/([0-9a-f]{32})\.geojson$")
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _static(self, key, version, digest):
+            etag = f'"{digest}"'
+            if etag in self.headers.get("If-None-Match", ""):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.end_headers()
+                return
+            try:
+                body = (STATIC_DIR / key / version / f"{digest}.geojson.gz").read_bytes()
+            except OSError:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/geo+json")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+            self.send_header("ETag", etag)
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                self.send_header("Content-Encoding", "gzip")
+            else:
+                body = gzip.decompress(body)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == "/health":
+                body = json.dumps({"store": str(LAYER_CACHE_DIR.resolve())}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            m = static.match(path)
+            if m:
+                self._static(*m.groups())
+                return
+            m = pattern.match(path)
+            if not m or tiles is None or m.group(1) not in TILE_LAYERS:
+                self.send_error(404)
+                return
+            z, x, y = (int(v) for v in m.groups()[1:])
+            try:
+                body = tiles.tile(m.group(1), z, x, y)
+            except Exception:
+                self.send_error(500)
+                return
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/vnd.mapbox-vector-tile")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(body, compresslevel=5)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+@st.cache_resource(show_spinner=False)
+def _map_data_server():
+    """Start the map data server on TILE_HOST:TILE_PORT; True if map data is being served there.
+
+    When another app process sharing the store already holds the port, its
+    server is used. Any other bind failure (the port taken by something
+    else, no permission, a bad TILE_HOST) returns False, so the map embeds
+    its layers instead of pointing at a URL nothing serves.
+    """
+    if not TILE_PORT:
+        return False
+    tiles = VectorTileServer(_layer_store()) if MVT_AVAILABLE else None
+    try:
+        server = ThreadingHTTPServer((TILE_HOST, TILE_PORT), _map_data_handler(tiles))
+    except OSError as e:
+        return e.errno == errno.EADDRINUSE and _sibling_map_data_server()
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="map-data-server", daemon=True).start()
+    return True
+
+
+def _sibling_map_data_server():
+    """True if the server on TILE_PORT is this app's, serving the same layer store."""
+    host = "127.0.0.1" if TILE_HOST in ("", "0.0.0.0") else TILE_HOST
+    try:
+        r = requests.get(f"http://{host}:{TILE_PORT}/health", timeout=2)
+        return r.ok and r.json().get("store") == str(LAYER_CACHE_DIR.resolve())
+    except (requests.RequestException, ValueError, AttributeError):
+        return False
+
+
 # ===================================================================
 # LOAD DATA
 # ===================================================================
@@ -424,6 +2129,484 @@ def _count(gdf):
         return 0
 
 
+# ===================================================================
+# HELPER: client-side point markers
+# ===================================================================
+# Leaflet callback for PointArrayLayer. Each data row is
+# [lat, lon, name, *values] for the column names in ``columns``; missing
+# values are null. The marker, popup and tooltip match the original
+# per-row folium.CircleMarker rendering.
+POINT_MARKER_JS = """function (row) {
+    var columns = %(columns)s;
+    var esc = function (v) {
+        return String(v).replace(/[&<>"']/g, function (c) {
+            return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}[c];
+        });
+    };
+    var marker = L.circleMarker([row[0], row[1]], %(style)s);
+    var html = "<div style='font-family:Inter,Trebuchet MS,sans-serif;min-width:200px;'>"
+        + "<b style='color:%(maroon)s;font-size:1rem;'>" + esc(row[2]) + "</b>"
+        + "<hr style='margin:4px 0;border-color:%(gold)s'>";
+    for (var i = 0; i < columns.length; i++) {
+        if (row[i + 3] !== null) {
+            html += "<b>" + esc(columns[i]) + ":</b> " + esc(row[i + 3]) + "<br>";
+        }
+    }
+    html += "<div style='margin-top:6px;font-size:0.7rem;color:#999;'>Lat " + row[0].toFixed(5)
+        + ", Lon " + row[1].toFixed(5) + "</div></div>";
+    marker.bindPopup(html, {maxWidth: 350});
+    marker.bindTooltip(esc(row[2]));
+    return marker;
+}"""
+
+
+def point_marker_rows(gdf, name_field):
+    """Compact [lat, lon, name, *values] rows for POINT_MARKER_JS, plus the column names.
+
+    Built column-wise: blank, "None" and missing values become null so the
+    popup skips them, as the per-row renderer did.
+    """
+    geoms = np.asarray(gdf.geometry.values)
+    lat, lon = shapely.get_y(geoms), shapely.get_x(geoms)  # NaN for missing geometry
+    located = ~(np.isnan(lat) | np.isnan(lon))
+    gdf = gdf[located]
+    if name_field in gdf.columns:
+        names = gdf[name_field].astype("string").fillna("Unknown Site")
+    else:
+        names = pd.Series("Unknown Site", index=gdf.index, dtype="string")
+    columns = [c for c in gdf.columns if c not in (gdf.geometry.name, name_field)]
+    values = gdf[columns].astype("string")
+    values = values.mask(values.apply(lambda col: col.str.strip().isin(["", "None"])))
+    rows = np.column_stack([
+        np.round(lat[located], 6).astype(object),
+        np.round(lon[located], 6).astype(object),
+        names.to_numpy(dtype=object),
+        values.to_numpy(dtype=object, na_value=None),
+    ])
+    return rows.tolist(), columns
+
+
+class PointArrayLayer(folium.map.Layer):
+    """Markers built in the browser by a JS ``callback`` from compact ``data`` rows.
+
+    Like FastMarkerCluster without the client-side clustering: the markers go
+    into a plain feature group. The callback can use ``map``, the Leaflet map,
+    also when the layer is added to a FeatureGroup rather than to the map.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function () {
+                var map = {{ this.map_name() }};
+                var callback = {{ this.callback }};
+                var data = {{ this.data|tojson }};
+                var group = L.featureGroup();
+                for (var i = 0; i < data.length; i++) {
+                    callback(data[i]).addTo(group);
+                }
+                return group;
+            })();
+        {% endmacro %}""")
+
+    def __init__(self, data, callback, name=None, overlay=True, control=True, show=True):
+        super().__init__(name=name, overlay=overlay, control=control, show=show)
+        self._name = "PointArrayLayer"
+        self.data = data
+        self.callback = callback
+
+    def map_name(self):
+        parent = self._parent
+        while not isinstance(parent, folium.Map):
+            parent = parent._parent
+        return parent.get_name()
+
+
+def point_marker_layer(gdf, name_field, layer_name, fill_color, border_color):
+    """One PointArrayLayer holding every point of ``gdf``, drawn in the browser."""
+    rows, columns = point_marker_rows(gdf, name_field)
+    style = {"radius": 7, "color": border_color, "weight": 2, "fill": True,
+             "fillColor": fill_color, "fillOpacity": 0.9}
+    callback = POINT_MARKER_JS % {
+        "columns": json.dumps(columns),
+        "style": json.dumps(style),
+        "maroon": BRAND["maroon"],
+        "gold": BRAND["gold"],
+    }
+    return PointArrayLayer(rows, callback, name=layer_name)
+
+
+# ===================================================================
+# HELPER: server-side point clusters
+# ===================================================================
+# Leaflet callback for a point layer's cluster bubbles. Each row is
+# [lat, lon, count]. Clicking a bubble zooms in two levels, towards where it
+# splits up.
+CLUSTER_MARKER_JS = """function (row) {
+    var count = row[2];
+    var size = count < 10 ? 30 : count < 100 ? 36 : count < 1000 ? 44 : 52;
+    var text = count < 1000 ? String(count) : (count / 1000).toFixed(1) + "k";
+    var icon = L.divIcon({
+        html: "<div style='width:" + size + "px;height:" + size + "px;line-height:" + (size - 6) + "px;"
+            + "border-radius:50%%;background:%(fill)s;border:3px solid %(gold)s;color:#fff;"
+            + "font:600 0.8rem Inter,Trebuchet MS,sans-serif;text-align:center;box-sizing:border-box;'>"
+            + text + "</div>",
+        className: "",
+        iconSize: [size, size]
+    });
+    var marker = L.marker([row[0], row[1]], {icon: icon});
+    marker.bindTooltip("<b>" + count + " sites</b><br>" + %(label)s);
+    marker.on("click", function () {
+        map.setView(marker.getLatLng(), Math.min(map.getZoom() + 2, %(max_zoom)d));
+    });
+    return marker;
+}"""
+
+
+class PointClusterIndex:
+    """Hierarchical clusters of one point layer, precomputed for every zoom.
+
+    In the style of supercluster: sites are projected to Web Mercator (0..1
+    across the world) and each zoom's clusters are made by merging the
+    clusters of the next zoom in that fall in the same grid cell of
+    CLUSTER_RADIUS pixels. A level keeps each cluster's weighted centroid and
+    its site count; level CLUSTER_MAX_ZOOM + 1 is the sites themselves.
+    Queries then only filter one level's arrays.
+    """
+
+    def __init__(self, gdf):
+        self.gdf = gdf
+        geoms = np.asarray(gdf.geometry.values)
+        x, y = shapely.get_x(geoms), shapely.get_y(geoms)  # NaN for missing geometry
+        self.row = np.flatnonzero(~(np.isnan(x) | np.isnan(y)))
+        lon, lat = x[self.row], y[self.row]
+
+        sin = np.sin(np.radians(np.clip(lat, -85.0511, 85.0511)))
+        level = {
+            "x": lon / 360 + 0.5,
+            "y": 0.5 - np.log((1 + sin) / (1 - sin)) / (4 * np.pi),
+            "count": np.ones(len(lon), dtype=np.int64),
+            "point": np.arange(len(lon)),
+        }
+        self.levels = {CLUSTER_MAX_ZOOM + 1: self._located(level)}
+        for zoom in range(CLUSTER_MAX_ZOOM, -1, -1):
+            level = self._merge(level, CLUSTER_RADIUS / (256 * 2 ** zoom))
+            self.levels[zoom] = self._located(level)
+
+    @staticmethod
+    def _merge(level, cell):
+        """Level above ``level``: its clusters merged per grid cell of size ``cell``."""
+        if len(level["x"]) == 0:
+            return level
+        cells = np.column_stack([level["x"] // cell, level["y"] // cell]).astype(np.int64)
+        _, first, group = np.unique(cells, axis=0, return_index=True, return_inverse=True)
+        group = group.ravel()
+        weight = level["count"]
+        total = np.bincount(group, weights=weight)
+        return {
+            "x": np.bincount(group, weights=level["x"] * weight) / total,
+            "y": np.bincount(group, weights=level["y"] * weight) / total,
+            "count": total.astype(np.int64),
+            "point": level["point"][first],  # the site, for single-site clusters
+        }
+
+    @staticmethod
+    def _located(level):
+        """``level`` with lon/lat of its centroids added."""
+        return dict(
+            level,
+            lon=level["x"] * 360 - 180,
+            lat=np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * level["y"])))),
+        )
+
+    def query(self, zoom, window=None):
+        """Clusters and single sites at ``zoom`` inside ``window`` (xmin, ymin, xmax, ymax).
+
+        Returns (clusters, singles): clusters is a list of [lat, lon, count]
+        rows for CLUSTER_MARKER_JS and singles the row positions, in the
+        layer's frame, of the sites that stand alone at this zoom.
+        """
+        level = self.levels[min(max(int(zoom), 0), CLUSTER_MAX_ZOOM + 1)]
+        keep = np.ones(len(level["lon"]), dtype=bool)
+        if window is not None:
+            xmin, ymin, xmax, ymax = window
+            keep = (level["lon"] >= xmin) & (level["lon"] <= xmax) & (level["lat"] >= ymin) & (level["lat"] <= ymax)
+        multi = keep & (level["count"] > 1)
+        clusters = [
+            [round(lat, 6), round(lon, 6), count]
+            for lat, lon, count in zip(
+                level["lat"][multi].tolist(), level["lon"][multi].tolist(), level["count"][multi].tolist(),
+            )
+        ]
+        singles = np.sort(self.row[level["point"][keep & (level["count"] == 1)]])
+        return clusters, singles
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _point_cluster_index(key, version):
+    """PointClusterIndex of one stored layer, built once per data version; None if it is empty."""
+    gdf = _read_layer(key, version)
+    if gdf is None or gdf.empty:
+        return None
+    return PointClusterIndex(gdf)
+
+
+def cluster_layer(clusters, key):
+    """PointArrayLayer drawing PointClusterIndex.query() ``clusters`` of ``key`` as counted bubbles."""
+    callback = CLUSTER_MARKER_JS % {
+        "label": json.dumps(LAYER_META[key]["label"]),
+        "fill": POINT_MARKER_COLORS[key][0],
+        "gold": BRAND["gold"],
+        "max_zoom": CLUSTER_MAX_ZOOM + 1,
+    }
+    return PointArrayLayer(clusters, callback, name=f"{LAYER_META[key]['label']} Clusters")
+
+
+# ===================================================================
+# HELPER: built-map cache
+# ===================================================================
+def map_layer_bytes(gdf):
+    """Rough in-memory size of a layer once folium holds it as GeoJSON-like lists and dicts."""
+    vertices = int(shapely.get_num_coordinates(np.asarray(gdf.geometry.values)).sum())
+    return vertices * 64 + len(gdf) * (512 + 64 * len(gdf.columns))
+
+
+def layer_versions_hash(load_status, keys):
+    """Short hash of the data versions of ``keys``, for cache keys."""
+    versions = "|".join(f"{key}={load_status.get(key, {}).get('version')}" for key in keys)
+    return hashlib.sha1(versions.encode()).hexdigest()[:16]
+
+
+class CachedMap:
+    def __init__(self, groups, nbytes):
+        self.groups = groups
+        self.nbytes = nbytes
+        self.lock = threading.Lock()
+
+
+class MapCache:
+    """LRU of built map layers (feature group lists), capped at MAP_CACHE_BYTES of estimated size.
+
+    The most recently added map is always kept, even if it alone is over
+    the cap.
+    """
+
+    def __init__(self, max_bytes=MAP_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.nbytes = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, groups, nbytes):
+        entry = CachedMap(groups, nbytes)
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self.entries[key] = entry
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes and len(self.entries) > 1:
+                _, evicted = self.entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+        return entry
+
+
+@st.cache_resource(show_spinner=False)
+def _map_cache():
+    return MapCache()
+
+
+class MapScripts(JSCSSMixin, folium.MacroElement):
+    """Script tags for layers that only reach the map later, as st_folium feature groups.
+
+    st_folium loads a map's scripts once, when it mounts it, from the
+    elements on the map itself.
+    """
+
+    def __init__(self, scripts):
+        super().__init__()
+        self._name = "MapScripts"
+        self.default_js = scripts
+
+
+def _base_map():
+    """The fixed map behind the Interactive Map tab, built fresh for each rerun.
+
+    Basemap tiles and data layers are never part of it: they go to
+    st_folium as feature groups, so a new band, basemap or layer set swaps
+    the layers in the mounted map instead of remounting it at its start view.
+    st_folium attaches those groups to the map it is given, so the map is
+    cheap and per-run rather than cached and shared between sessions.
+    """
+    fmap = folium.Map(location=[34.55, -95.4], zoom_start=MAP_ZOOM, tiles=None)
+    Fullscreen(position="topleft").add_to(fmap)
+    MeasureControl(position="bottomleft", primary_length_unit="miles", primary_area_unit="acres").add_to(fmap)
+    LocateControl(strings={"title": "My location"}).add_to(fmap)
+    scripts = []
+    if MVT_AVAILABLE and _map_data_server():
+        scripts += VectorGridProtobuf.default_js
+    if MAP_ENCODING == "topojson" and TOPOJSON_AVAILABLE:
+        scripts += TopoJsonLayer.default_js
+    MapScripts(scripts).add_to(fmap)
+    return fmap
+
+
+# ===================================================================
+# HELPER: site search index
+# ===================================================================
+def _search_tokens(text):
+    return re.findall(r"[a-z0-9]+", str(text).lower())
+
+
+def _trigrams(token):
+    padded = f"  {token} "  # as pg_trgm pads words
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _csr(keys, values, size):
+    """(indptr, values grouped by key) for integer ``keys`` in 0..size-1."""
+    order = np.argsort(keys, kind="stable")
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=size), out=indptr[1:])
+    return indptr, values[order]
+
+
+def _gather(indptr, ids):
+    """Positions of every entry of the ``ids`` rows of a CSR index, and each row's entry count."""
+    starts, lengths = indptr[ids], indptr[ids + 1] - indptr[ids]
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(lengths.sum()), lengths
+
+
+class SiteSearchIndex:
+    """Token index over the point layers' site names and SEARCH_FIELDS.
+
+    Every name and field value is split into lower-case words. The sorted
+    vocabulary maps each word to the sites containing it (with the field's
+    weight), and each word's trigrams map back to the vocabulary. A query
+    word then matches sites exactly (score 1), as a prefix of a longer word
+    (0.8, one contiguous slice of the sorted vocabulary), or, for words of
+    letters, by trigram similarity for misspellings (0.6 x similarity).
+    Sites must match every query word and rank by the summed scores.
+    """
+
+    def __init__(self, frames):
+        layers, names, lats, lons = [], [], [], []
+        words, docs, weights = [], [], []
+        offset = 0
+        for key, gdf in frames.items():
+            name_field = POINT_NAME_FIELDS[key]
+            geoms = np.asarray(gdf.geometry.values)
+            fields = [(name_field, SEARCH_NAME_WEIGHT)] + [(f, 1.0) for f in SEARCH_FIELDS.get(key, ())]
+            for field, weight in fields:
+                if field not in gdf.columns:
+                    continue
+                values = gdf[field].astype("string").fillna("").to_numpy(dtype=object)
+                tokens = {value: _search_tokens(value) for value in set(values)}
+                for row, value in enumerate(values):
+                    for token in tokens[value]:
+                        words.append(token)
+                        docs.append(offset + row)
+                        weights.append(weight)
+            if name_field in gdf.columns:
+                site_names = gdf[name_field].astype("string").fillna("Unknown Site")
+            else:
+                site_names = pd.Series("Unknown Site", index=gdf.index, dtype="string")
+            layers.append(np.full(len(gdf), LAYER_META[key]["label"], dtype=object))
+            names.append(site_names.to_numpy(dtype=object))
+            lats.append(shapely.get_y(geoms))
+            lons.append(shapely.get_x(geoms))
+            offset += len(gdf)
+        self.size = offset
+        self.layer = np.concatenate(layers) if layers else np.empty(0, dtype=object)
+        self.name = np.concatenate(names) if names else np.empty(0, dtype=object)
+        self.lat = np.concatenate(lats) if lats else np.empty(0)
+        self.lon = np.concatenate(lons) if lons else np.empty(0)
+
+        # word -> (site, weight), keeping each site's best weight per word
+        self.vocab, word_ids = np.unique(np.array(words, dtype=str), return_inverse=True)
+        entries = pd.DataFrame({"word": word_ids.ravel(), "doc": np.array(docs, dtype=np.int64),
+                                "weight": np.array(weights)})
+        entries = entries.groupby(["word", "doc"], sort=True, as_index=False)["weight"].max()
+        self.word_ptr, self.word_docs = _csr(entries["word"].to_numpy(), entries["doc"].to_numpy(), len(self.vocab))
+        self.word_weights = entries["weight"].to_numpy()
+
+        # trigram -> word
+        grams, gram_words = [], []
+        for word_id, word in enumerate(self.vocab):
+            for gram in _trigrams(word):
+                grams.append(gram)
+                gram_words.append(word_id)
+        self.grams, gram_ids = np.unique(np.array(grams, dtype=str), return_inverse=True)
+        self.gram_ptr, self.gram_words = _csr(gram_ids.ravel(), np.array(gram_words, dtype=np.int64), len(self.grams))
+        self.word_grams = np.bincount(np.array(gram_words, dtype=np.int64), minlength=len(self.vocab))
+
+    def _word_scores(self, term):
+        """(vocabulary ids, match scores) for one query word."""
+        lo = np.searchsorted(self.vocab, term, side="left")
+        hi = np.searchsorted(self.vocab, term + "\uffff", side="left")  # every word starting with term
+        ids = [np.arange(lo, hi)]
+        scores = [np.where(self.vocab[lo:hi] == term, 1.0, 0.8)]
+        if len(term) >= 3 and term.isalpha() and len(self.grams):  # numbers (IDs, ZIPs) match exactly or by prefix
+            term_grams = _trigrams(term)
+            grams = np.array(sorted(term_grams))
+            gram_ids = np.minimum(np.searchsorted(self.grams, grams), len(self.grams) - 1)
+            gram_ids = gram_ids[self.grams[gram_ids] == grams]  # trigrams the vocabulary has
+            positions, _ = _gather(self.gram_ptr, gram_ids)
+            shared = np.bincount(self.gram_words[positions], minlength=len(self.vocab))
+            similarity = shared / (len(term_grams) + self.word_grams - shared)
+            similarity[lo:hi] = 0  # already matched as a prefix
+            fuzzy = np.flatnonzero(similarity >= SEARCH_FUZZY_MIN)
+            ids.append(fuzzy)
+            scores.append(0.6 * similarity[fuzzy])
+        return np.concatenate(ids), np.concatenate(scores)
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """Best ``limit`` sites for ``query`` and how many sites matched in all.
+
+        Results have the Site Search columns _source_layer, _name, _lat and
+        _lon, best match first.
+        """
+        terms = list(dict.fromkeys(_search_tokens(query)))
+        if not terms or not self.size:
+            return pd.DataFrame(columns=["_source_layer", "_name", "_lat", "_lon"]), 0
+        total = np.zeros(self.size)
+        matched = np.zeros(self.size, dtype=np.int64)
+        for term in terms:
+            ids, scores = self._word_scores(term)
+            positions, lengths = _gather(self.word_ptr, ids)
+            best = np.zeros(self.size)
+            np.maximum.at(best, self.word_docs[positions], np.repeat(scores, lengths) * self.word_weights[positions])
+            total += best
+            matched += best > 0
+        hits = np.flatnonzero(matched == len(terms))
+        top = hits[np.argsort(-total[hits], kind="stable")[:limit]]
+        results = pd.DataFrame({
+            "_source_layer": self.layer[top],
+            "_name": self.name[top],
+            "_lat": self.lat[top],
+            "_lon": self.lon[top],
+        })
+        return results, len(hits)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _site_search_index(layers):
+    """SiteSearchIndex over ``layers`` ((key, version) pairs), built once per data version."""
+    frames = {}
+    for key, version in layers:
+        gdf = _read_layer(key, version)
+        if gdf is not None and not gdf.empty:
+            frames[key] = gdf
+    return SiteSearchIndex(frames)
+
+
 # ===================================================================
 # SIDEBAR
 # ===================================================================
@@ -440,15 +2623,40 @@ with st.sidebar:
     for key, meta in LAYER_META.items():
         default_on = key in ("cno", "bia", "deq_bf", "deq_sf", "epa")
         visible_layers[key] = st.checkbox(meta["label"], value=default_on, key=f"layer_{key}")
+    viewport_mode = st.checkbox(
+        "Load only features in view", value=False, key="viewport_mode",
+        help=f"From zoom {VIEWPORT_MIN_ZOOM} in, send only the features around the visible area.",
+    )
 
     st.markdown("---")
 
     # Data load status
     st.markdown(f"<h2 style='color:{BRAND['maroon']}'>Data Status</h2>", unsafe_allow_html=True)
     for key, meta in LAYER_META.items():
-        status_icon = "\u2705" if load_status.get(key) else "\u274C"
+        layer_status = load_status.get(key, {})
+        status = layer_status.get("status", "failed")
+        status_icon = {"ok": "\u2705", "partial": "\u26A0\uFE0F"}.get(status, "\u274C")
         count = _count(gis_data.get(key))
-        st.markdown(f"{status_icon} **{meta['label']}** — {count} features")
+        notes = [n for n, flag in (("partial", status == "partial"), ("stale", layer_status.get("stale"))) if flag]
+        note = f" ({', '.join(notes)})" if notes else ""
+        refreshed = layer_status.get("fetched_at")
+        refreshed = datetime.fromisoformat(refreshed).strftime("%b %d %H:%M") if refreshed else "never"
+        clip = layer_status.get("clip")
+        if clip:
+            refreshed += f" · clipped {clip['rows_out']} of {clip['rows_in']} in {clip['seconds'] * 1000:.0f} ms"
+        memory = layer_status.get("memory")
+        if memory:
+            refreshed += (f" · attributes {memory['bytes_before'] / 1024:,.0f} → "
+                          f"{memory['bytes_after'] / 1024:,.0f} KB")
+        breaker = layer_status.get("breaker") or {}
+        if breaker.get("state") == "open":
+            retry = datetime.fromtimestamp(breaker["retry_at"]).strftime("%H:%M")
+            refreshed += f" · source unavailable, retrying after {retry}"
+        st.markdown(
+            f"{status_icon} **{meta['label']}** — {count} features{note}<br>"
+            f"<span style='font-size:0.75rem; color:#888;'>Last refreshed: {refreshed}</span>",
+            unsafe_allow_html=True,
+        )
 
     st.markdown("---")
 
@@ -519,90 +2727,134 @@ with tab_map:
     m_cols[3].metric("Superfund", _count(gis_data.get("deq_sf")))
     m_cols[4].metric("EPA CIMC", _count(gis_data.get("epa")))
 
-    # Build Folium map
-    fmap = folium.Map(location=[34.55, -95.4], zoom_start=8, tiles=basemap_tiles)
+    # The view the user last left the map at; polygons are drawn at its zoom band
+    map_view = st.session_state.get("main_map") or {}
+    map_zoom = map_view.get("zoom") or MAP_ZOOM
+    tolerance = display_tolerance(map_zoom)
+    cluster_zoom = min(int(map_zoom), CLUSTER_MAX_ZOOM + 1)
 
-    # Plugins
-    Fullscreen(position="topleft").add_to(fmap)
-    MeasureControl(position="bottomleft", primary_length_unit="miles", primary_area_unit="acres").add_to(fmap)
-    LocateControl(strings={"title": "My location"}).add_to(fmap)
+    # Viewport mode: load the window around the view instead of whole layers
+    map_window = None
+    if viewport_mode and map_zoom >= VIEWPORT_MIN_ZOOM:
+        map_window = viewport_window(map_view.get("bounds"), map_zoom, st.session_state.get("viewport_window"))
+    st.session_state["viewport_window"] = map_window
 
-    # --- Polygon / line layers ---
-    def _add_polygon(key, gdf, name, style_fn):
-        if gdf is not None and visible_layers.get(key):
-            folium.GeoJson(gdf, name=name, style_function=style_fn).add_to(fmap)
-
-    _add_polygon("cno", gis_data.get("cno"), "CNO Reservation Boundary",
-                 lambda x: {"fillColor": "none", "color": BRAND["maroon"], "weight": 3, "dashArray": "6 6"})
-    _add_polygon("bia", gis_data.get("bia"), "BIA Trust Land",
-                 lambda x: {"fillColor": BRAND["gold"], "color": BRAND["gold"], "weight": 1, "fillOpacity": 0.55})
-    _add_polygon("usfs", gis_data.get("usfs"), "USFS Ouachita NF",
-                 lambda x: {"fillColor": BRAND["green"], "color": BRAND["green"], "weight": 1, "fillOpacity": 0.35})
-    _add_polygon("usace", gis_data.get("usace"), "USACE Reservoirs",
-                 lambda x: {"fillColor": BRAND["blue"], "color": BRAND["blue"], "weight": 1, "fillOpacity": 0.45})
-    _add_polygon("wmas", gis_data.get("wmas"), "State WMAs",
-                 lambda x: {"fillColor": BRAND["sage"], "color": BRAND["sage"], "weight": 1, "fillOpacity": 0.45})
-    _add_polygon("nwrs", gis_data.get("nwrs"), "Federal NWRs",
-                 lambda x: {"fillColor": BRAND["sky"], "color": BRAND["sky"], "weight": 1, "fillOpacity": 0.45})
-
-    # --- Point layers ---
-    def add_point_markers(gdf, name_field, layer_name, fill_color, border_color, target_map):
-        if gdf is None or len(gdf) == 0:
-            return
-        cluster = MarkerCluster(name=layer_name)
-        for _, row in gdf.iterrows():
-            geom = row.geometry
-            if geom is None:
+    def build_map():
+        """Build the map layers for the current sidebar settings; returns (feature groups, estimated bytes).
+
+        One group per LayerControl entry, after a basemap group kept out of
+        the control.
+        """
+        nbytes = 0
+        basemap = folium.FeatureGroup(name=basemap_label, control=False)
+        folium.TileLayer(basemap_tiles).add_to(basemap)
+        groups = [basemap]
+
+        def _group(name):
+            group = folium.FeatureGroup(name=name)
+            groups.append(group)
+            return group
+
+        # --- Polygon / line layers ---
+        def _add_polygon(key, gdf, name, style_fn):
+            nonlocal nbytes
+            if gdf is not None and visible_layers.get(key):
+                served = _map_data_server()
+                if key in TILE_LAYERS and served and MVT_AVAILABLE:
+                    style = dict(style_fn(None), fill=True)
+                    url = f"{TILE_URL}/{key}/{load_status[key]['version']}/{{z}}/{{x}}/{{y}}.pbf"
+                    VectorGridProtobuf(url, name, {"vectorTileLayerStyles": {key: style}}).add_to(_group(name))
+                    return
+                if served and map_window is None:
+                    version = load_status[key]["version"]
+                    digest = static_geojson(key, version, tolerance)
+                    if digest is not None:
+                        GeoJsonUrlLayer(f"{TILE_URL}/geojson/{key}/{version}/{digest}.geojson", name,
+                                        style_fn(None)).add_to(_group(name))
+                    return
+                topo = MAP_ENCODING == "topojson" and TOPOJSON_AVAILABLE
+                if topo and map_window is None:
+                    data = topojson_layer(key, load_status[key]["version"], tolerance)
+                    if data is not None:
+                        TopoJsonLayer(data, name, style_fn(None)).add_to(_group(name))
+                        nbytes += 2 * len(data)
+                    return
+                if map_window is not None:
+                    gdf = features_in_view(key, load_status[key]["version"], tolerance, map_window)
+                elif tolerance is not None:
+                    gdf = simplified_layer(key, load_status[key]["version"], tolerance)
+                if gdf is None or gdf.empty:
+                    return
+                if topo:
+                    data = encode_topojson(gdf, tolerance)
+                    TopoJsonLayer(data, name, style_fn(None)).add_to(_group(name))
+                    nbytes += 2 * len(data)
+                    return
+                folium.GeoJson(gdf, name=name, style_function=style_fn).add_to(_group(name))
+                nbytes += map_layer_bytes(gdf)
+
+        _add_polygon("cno", gis_data.get("cno"), "CNO Reservation Boundary",
+                     lambda x: {"fillColor": "none", "color": BRAND["maroon"], "weight": 3, "dashArray": "6 6"})
+        _add_polygon("bia", gis_data.get("bia"), "BIA Trust Land",
+                     lambda x: {"fillColor": BRAND["gold"], "color": BRAND["gold"], "weight": 1, "fillOpacity": 0.55})
+        _add_polygon("usfs", gis_data.get("usfs"), "USFS Ouachita NF",
+                     lambda x: {"fillColor": BRAND["green"], "color": BRAND["green"], "weight": 1, "fillOpacity": 0.35})
+        _add_polygon("usace", gis_data.get("usace"), "USACE Reservoirs",
+                     lambda x: {"fillColor": BRAND["blue"], "color": BRAND["blue"], "weight": 1, "fillOpacity": 0.45})
+        _add_polygon("wmas", gis_data.get("wmas"), "State WMAs",
+                     lambda x: {"fillColor": BRAND["sage"], "color": BRAND["sage"], "weight": 1, "fillOpacity": 0.45})
+        _add_polygon("nwrs", gis_data.get("nwrs"), "Federal NWRs",
+                     lambda x: {"fillColor": BRAND["sky"], "color": BRAND["sky"], "weight": 1, "fillOpacity": 0.45})
+
+        # --- Point layers: clustered on the server for the current zoom ---
+        # Each layer is clustered on its own, and its sites and bubbles share
+        # one group so a single LayerControl toggle shows or hides both
+        for key in POINT_NAME_FIELDS:
+            if not visible_layers.get(key) or gis_data.get(key) is None:
                 continue
-            try:
-                lat, lon = geom.y, geom.x
-                if math.isnan(lat) or math.isnan(lon):
-                    continue
-            except Exception:
+            index = _point_cluster_index(key, load_status[key]["version"])
+            if index is None:
                 continue
-            name_val = str(row.get(name_field, "Unknown Site"))
-            # Build rich popup
-            popup_parts = [
-                f"<div style='font-family:Inter,Trebuchet MS,sans-serif;min-width:200px;'>",
-                f"<b style='color:{BRAND['maroon']};font-size:1rem;'>{name_val}</b><hr style='margin:4px 0;border-color:{BRAND['gold']}'>",
-            ]
-            for col in gdf.columns:
-                if col in ("geometry", name_field):
-                    continue
-                val = row.get(col)
-                if val is not None and str(val).strip() and str(val) != "None":
-                    popup_parts.append(f"<b>{col}:</b> {val}<br>")
-            popup_parts.append(
-                f"<div style='margin-top:6px;font-size:0.7rem;color:#999;'>Lat {lat:.5f}, Lon {lon:.5f}</div></div>"
-            )
-            folium.CircleMarker(
-                location=[lat, lon],
-                radius=7,
-                color=border_color,
-                weight=2,
-                fill=True,
-                fillColor=fill_color,
-                fillOpacity=0.9,
-                popup=folium.Popup("".join(popup_parts), max_width=350),
-                tooltip=name_val,
-            ).add_to(cluster)
-        cluster.add_to(target_map)
-
-    if visible_layers.get("deq_bf"):
-        add_point_markers(gis_data.get("deq_bf"), "PROJECT_NA", "DEQ Brownfields", BRAND["maroon"], BRAND["gold"], fmap)
-    if visible_layers.get("deq_sf"):
-        add_point_markers(gis_data.get("deq_sf"), "NPL_SITE", "DEQ Superfund/NPL", BRAND["red"], BRAND["white"], fmap)
-    if visible_layers.get("deq_vcp"):
-        add_point_markers(gis_data.get("deq_vcp"), "Facility_N", "DEQ Voluntary Cleanup", BRAND["maroon"], BRAND["white"], fmap)
-    if visible_layers.get("epa"):
-        add_point_markers(gis_data.get("epa"), "PRIMARY_NAME", "EPA CIMC Sites", BRAND["brown"], BRAND["white"], fmap)
-
-    folium.LayerControl(collapsed=False).add_to(fmap)
+            clusters, singles = index.query(cluster_zoom, map_window)
+            group = _group(LAYER_META[key]["label"])
+            if len(singles):
+                gdf = index.gdf.iloc[singles]
+                point_marker_layer(gdf, POINT_NAME_FIELDS[key], LAYER_META[key]["label"],
+                                   *POINT_MARKER_COLORS[key]).add_to(group)
+                nbytes += map_layer_bytes(gdf)
+            if clusters:
+                cluster_layer(clusters, key).add_to(group)
+                nbytes += 512 * len(clusters)
+
+        return groups, nbytes
+
+    # Reuse the built map while the basemap, visible layers, zoom band (and
+    # cluster zoom, with point layers on) and layer data are unchanged, so
+    # other widgets don't pay for rebuilding it
+    shown = tuple(key for key in LAYER_META if visible_layers.get(key))
+    point_zoom = cluster_zoom if any(key in POINT_NAME_FIELDS for key in shown) else None
+    map_key = (basemap_label, shown, tolerance, point_zoom, map_window, layer_versions_hash(load_status, shown))
+    map_cache = _map_cache()
+    cached_map = map_cache.get(map_key)
+    if cached_map is None:
+        cached_map = map_cache.put(map_key, *build_map())
 
     # Render map + legend side-by-side
     map_col, legend_col = st.columns([4, 1])
     with map_col:
-        st_folium(fmap, width="100%", height=680, returned_objects=[])
+        # Only zoom (and bounds, in viewport mode) reruns the script; panning
+        # doesn't. The layers go in as feature groups on the fixed base map,
+        # so swapping them keeps the mounted map and its view.
+        # The cached layers are shared across sessions, and folium
+        # rendering is not thread-safe
+        with cached_map.lock:
+            st_folium(
+                _base_map(), key="main_map", width="100%", height=680,
+                returned_objects=["zoom", "bounds"] if viewport_mode else ["zoom"],
+                zoom=map_zoom,
+                feature_group_to_add=cached_map.groups,
+                layer_control=folium.LayerControl(collapsed=False),
+            )
 
     with legend_col:
         st.markdown(f"### Map Legend")
@@ -646,26 +2898,45 @@ with tab_data:
     else:
         selected_label = st.selectbox("Select dataset", list(explorer_options.keys()))
         selected_key = explorer_options[selected_label]
-        gdf = gis_data[selected_key]
-
-        # Drop geometry for display
-        display_df = gdf.drop(columns=["geometry"], errors="ignore")
+        version = load_status[selected_key]["version"]
+        display_df = attribute_table(selected_key, version)
 
         st.markdown(f"**{selected_label}** -- {len(display_df)} records")
 
         # Column filter
         all_cols = list(display_df.columns)
         shown_cols = st.multiselect("Columns to display", all_cols, default=all_cols[:10])
-        if shown_cols:
-            st.dataframe(display_df[shown_cols], use_container_width=True, height=420)
+
+        # Filter, sort and page on the server; only the current page is sent
+        f_col, s_col, o_col, p_col = st.columns([3, 2, 1, 1])
+        row_filter = f_col.text_input("Filter rows", placeholder="Text in any column")
+        sort_col = s_col.selectbox("Sort by", ["(none)"] + all_cols)
+        descending = o_col.selectbox("Order", ["Ascending", "Descending"]) == "Descending"
+        page_size = p_col.selectbox("Rows per page", EXPLORER_PAGE_SIZES)
+        rows = attribute_rows(selected_key, version, row_filter.strip(), sort_col, descending)
+
+        # Back to page 1 whenever the dataset, filter, sort or page size changes
+        pages = max(1, math.ceil(len(rows) / page_size))
+        view = (selected_key, row_filter.strip(), sort_col, descending, page_size)
+        if st.session_state.get("explorer_view") != view:
+            st.session_state["explorer_view"] = view
+            st.session_state["explorer_page"] = 1
+        elif st.session_state.get("explorer_page", 1) > pages:
+            st.session_state["explorer_page"] = pages
+        page = st.number_input("Page", min_value=1, max_value=pages, key="explorer_page")
+        start = (page - 1) * page_size
+        page_df = display_df.iloc[rows[start:start + page_size]]
+        st.dataframe(page_df[shown_cols] if shown_cols else page_df, use_container_width=True, height=420)
+        if len(rows):
+            st.caption(f"Rows {start + 1:,}–{min(start + page_size, len(rows)):,} of {len(rows):,} matching, page {page} of {pages}")
         else:
-            st.dataframe(display_df, use_container_width=True, height=420)
+            st.caption("No rows match the filter.")
 
-        # Summary stats for numeric columns
-        numeric_df = display_df.select_dtypes(include=["number"])
-        if not numeric_df.empty:
+        # Summary stats for numeric columns, computed once per layer version
+        stats = attribute_stats(selected_key, version)
+        if stats is not None:
             with st.expander("Summary Statistics"):
-                st.dataframe(numeric_df.describe().T, use_container_width=True)
+                st.dataframe(stats, use_container_width=True)
 
 
 # ===================================================================
@@ -678,25 +2949,14 @@ with tab_search:
     search_query = st.text_input("Enter site name or keyword", placeholder="e.g., Creek, Mine, Lumber...")
 
     if search_query:
-        search_results = []
-        for key, name_field in POINT_NAME_FIELDS.items():
-            gdf = gis_data.get(key)
-            if gdf is None:
-                continue
-            if name_field not in gdf.columns:
-                continue
-            mask = gdf[name_field].astype(str).str.contains(search_query, case=False, na=False)
-            matched = gdf[mask].copy()
-            if len(matched) > 0:
-                matched["_source_layer"] = LAYER_META[key]["label"]
-                matched["_name"] = matched[name_field].astype(str)
-                matched["_lat"] = matched.geometry.y
-                matched["_lon"] = matched.geometry.x
-                search_results.append(matched[["_source_layer", "_name", "_lat", "_lon"]])
-
-        if search_results:
-            results_df = gpd.pd.concat(search_results, ignore_index=True)
-            st.success(f"Found {len(results_df)} matching site(s).")
+        search_layers = tuple(
+            (key, load_status[key]["version"]) for key in POINT_NAME_FIELDS if gis_data.get(key) is not None
+        )
+        results_df, match_count = _site_search_index(search_layers).search(search_query)
+
+        if match_count:
+            shown_note = f" Showing the best {len(results_df)}." if match_count > len(results_df) else ""
+            st.success(f"Found {match_count} matching site(s).{shown_note}")
             st.dataframe(
                 results_df.rename(columns={"_source_layer": "Layer", "_name": "Site Name", "_lat": "Latitude", "_lon": "Longitude"}),
                 use_container_width=True,
@@ -738,6 +2998,16 @@ with tab_export:
         export_key = export_options[export_label]
         export_gdf = gis_data[export_key]
 
+        # The app copy is generalised (see LAYER_FETCH_PROFILES); raw data is fetched on request
+        if st.checkbox("Raw data: all attributes, full-precision geometry", key="export_raw"):
+            try:
+                with st.spinner(f"Fetching full-fidelity {export_label} from the source service..."):
+                    export_gdf = load_full_layer(export_key, load_status[export_key]["version"])
+            except (ArcGISFetchError, PartialLayerError):
+                st.error("The source service could not supply raw data right now; exporting the map copy instead.")
+            if export_gdf is None:
+                export_gdf = gis_data[export_key]
+
         exp_col1, exp_col2 = st.columns(2)
 
         # CSV export
@@ -0,0 +1,54 @@
+"""Site Search over the point layers' names and SEARCH_FIELDS attributes."""
+
+import sys
+from pathlib import Path
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import Point
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+from bench_fetch import APP, load_app  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return load_app(APP)
+
+
+def _sites(rows):
+    return gpd.GeoDataFrame(rows, geometry=[Point(-95.4, 34.5)] * len(rows), crs="EPSG:4326")
+
+
+@pytest.fixture(scope="module")
+def index(app):
+    return app.SiteSearchIndex({
+        "deq_bf": _sites([
+            {"PROJECT_NA": "Old Mill Site", "STATUS": "Active", "ADDRESS": "210 Lumber Rd",
+             "CITY": "Idabel", "COUNTY": "McCurtain"},
+            {"PROJECT_NA": "Depot Yard", "STATUS": "Closed", "ADDRESS": "5 Rail St",
+             "CITY": "Durant", "COUNTY": "Bryan"},
+        ]),
+        "deq_sf": _sites([
+            {"NPL_SITE": "Tar Creek", "EPA_ID": "OKD980629844", "STATUS": "Final",
+             "CITY": "Picher", "COUNTY": "Ottawa"},
+        ]),
+        "deq_vcp": _sites([
+            {"Facility_N": "Former Gas Station", "Status": "Enrolled", "Address": "12 Main St",
+             "City": "Hugo", "County": "Choctaw"},
+        ]),
+    })
+
+
+@pytest.mark.parametrize("query, name", [
+    ("Idabel", "Old Mill Site"),
+    ("lumber rd", "Old Mill Site"),
+    ("durant", "Depot Yard"),
+    ("okd980629844", "Tar Creek"),
+    ("hugo main", "Former Gas Station"),
+])
+def test_deq_site_found_by_attribute(index, query, name):
+    results, count = index.search(query)
+    assert count == 1
+    assert results["_name"].tolist() == [name]
+
@@ -0,0 +1,205 @@
+"""Benchmark the ArcGIS fetch pipeline against the local mock services.
+
+Starts tools/mock_arcgis.py in-process, then runs each case in a fresh
+Python process (so peak RSS belongs to that case alone) with
+TRTOOL_ARCGIS_ROOT pointing at the mock:
+
+    query_sequential   arcgis_query(parallel=False) on one polygon layer
+    query_parallel     arcgis_query(parallel=True) on the same layer
+    points             arcgis_points on one DEQ point layer
+    fetch_layers       fetch_layers() for every LAYER_SOURCES entry, clipped
+    store_read         LayerStore.read of the layers fetch_layers just wrote
+    sync               sync_layer() of those layers after SYNC_EDITS were made
+                       on every mock layer, reported against fetch_layers
+
+app.py is a Streamlit script, so the cases load only its imports (optional
+ones included), constants, functions and classes (see load_app) rather than
+running the UI.
+
+    python tools/bench_fetch.py --features 20000 --latency 0.05
+    python tools/bench_fetch.py --cases query_sequential,query_parallel --repeat 3 --json out.json
+"""
+
+import argparse
+import ast
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from mock_arcgis import MockArcGIS, serve  # noqa: E402
+
+APP = Path(__file__).resolve().parent.parent / "app.py"
+CASES = ("query_sequential", "query_parallel", "points", "fetch_layers", "store_read", "sync")
+QUERY_LAYER = "usace"
+POINT_LAYER = "deq_bf"
+# Edits made to every non-boundary mock layer before the sync case
+SYNC_EDITS = {"added": 20, "deleted": 10, "edited": 50}
+
+
+def app_source(path):
+    """Source of the Streamlit app in ``path``.
+
+    While app.py still carries merge-conflict blocks, only the first side
+    of each block (this app; the other side is the older TR Land Tool) is
+    kept, so the file parses.
+    """
+    lines, side = [], None
+    for line in Path(path).read_text().splitlines(keepends=True):
+        if line.startswith("<<<<<<< "):
+            side = "ours"
+        elif line.startswith("=======") and side == "ours":
+            side = "theirs"
+        elif line.startswith(">>>>>>> ") and side == "theirs":
+            side = None
+        elif side != "theirs":
+            lines.append(line)
+    return "".join(lines)
+
+
+def load_app(path):
+    """Exec the definitions in app.py without running its Streamlit UI."""
+    tree = ast.parse(app_source(path), filename=str(path))
+    keep = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.ClassDef, ast.Try)):
+            keep.append(node)  # top-level try blocks are the optional imports
+        elif isinstance(node, ast.Assign) and all(
+            isinstance(t, ast.Name) and t.id.lstrip("_").isupper() for t in node.targets
+        ):
+            keep.append(node)
+    module = types.ModuleType("app")
+    module.__file__ = str(path)
+    sys.modules["app"] = module
+    exec(compile(ast.Module(keep, []), str(path), "exec"), module.__dict__)
+    return module
+
+
+def _rows(gdf):
+    return 0 if gdf is None else len(gdf)
+
+
+def run_case(case, app_path):
+    """Run one case in this process; returns (features, seconds)."""
+    app = load_app(app_path)
+    src = app.LAYER_SOURCES
+    start = time.perf_counter()
+    if case in ("query_sequential", "query_parallel"):
+        gdf = app.arcgis_query(src[QUERY_LAYER]["url"], parallel=case == "query_parallel")
+        features = _rows(gdf)
+    elif case == "points":
+        spec = src[POINT_LAYER]
+        gdf = app.arcgis_points(spec["url"], lat_field=spec["lat_field"], lon_field=spec["lon_field"])
+        features = _rows(gdf)
+    elif case == "fetch_layers":
+        data, _ = app.fetch_layers()
+        store = app.LayerStore(app.LAYER_CACHE_DIR)
+        for key, gdf in data.items():
+            store.write(key, gdf, "ok")
+        features = sum(_rows(g) for g in data.values())
+    elif case == "store_read":
+        store = app.LayerStore(app.LAYER_CACHE_DIR)
+        features = sum(_rows(store.read(key)) for key in src)
+    elif case == "sync":
+        store = app.LayerStore(app.LAYER_CACHE_DIR)
+        cno_bounds = store.read("cno")
+        features = 0
+        for key in src:
+            if key == "cno":
+                continue
+            gdf = app.sync_layer(key, store, cno_bounds)
+            if gdf is None:
+                raise RuntimeError(f"{key} has no objectId snapshot; run the fetch_layers case first")
+            features += len(gdf)
+            store.write(key, gdf, "ok")
+    else:
+        raise ValueError(f"unknown case {case!r}")
+    return features, time.perf_counter() - start
+
+
+def _child(args):
+    features, seconds = run_case(args.case, args.app)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / 1024 ** 2 if sys.platform == "darwin" else rss / 1024
+    print(json.dumps({"features": features, "seconds": seconds, "peak_rss_mb": rss_mb}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default=str(APP), help="path to app.py")
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated subset of: " + ", ".join(CASES))
+    parser.add_argument("--features", type=int, default=10000, help="features per synthetic layer")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every mock response")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of mock requests answered with 503")
+    parser.add_argument("--max-record-count", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=1, help="runs per case; the fastest is reported")
+    parser.add_argument("--json", metavar="PATH", help="also write results as JSON")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        _child(args)
+        return
+
+    mock = MockArcGIS(features=args.features, latency=args.latency, jitter=args.jitter,
+                      fail_rate=args.fail_rate, max_record_count=args.max_record_count)
+    server, url = serve(mock)
+    cache_dir = tempfile.mkdtemp(prefix="trtool-bench-")
+    env = dict(os.environ, TRTOOL_ARCGIS_ROOT=url, TRTOOL_CACHE_DIR=cache_dir)
+    print(f"mock {url}: {args.features} features/layer, {args.latency}s latency, "
+          f"maxRecordCount {args.max_record_count}")
+
+    results = []
+    header = f"{'case':<18}{'features':>10}{'wall s':>9}{'feat/s':>10}{'peak MB':>9}{'requests':>10}{'MB sent':>9}"
+    print(header)
+    print("-" * len(header))
+    for case in args.cases.split(","):
+        best = None
+        for _ in range(args.repeat):
+            if case == "sync":
+                for layer in list(mock.layers.values()):
+                    if layer.kind != "boundary":
+                        layer.mutate(**SYNC_EDITS)
+            requests_before, bytes_before = mock.requests, mock.bytes_sent
+            proc = subprocess.run([sys.executable, __file__, "--app", args.app, "--case", case],
+                                  env=env, capture_output=True, text=True)
+            if proc.returncode != 0:
+                print(f"{case:<18}failed\n{proc.stderr.strip()}")
+                break
+            run = json.loads(proc.stdout.strip().splitlines()[-1])
+            run.update(case=case, requests=mock.requests - requests_before,
+                       mb_sent=(mock.bytes_sent - bytes_before) / 1024 ** 2)
+            if best is None or run["seconds"] < best["seconds"]:
+                best = run
+        if best is None:
+            continue
+        rate = best["features"] / best["seconds"] if best["seconds"] else 0.0
+        best["features_per_s"] = rate
+        results.append(best)
+        print(f"{case:<18}{best['features']:>10}{best['seconds']:>9.2f}{rate:>10.0f}"
+              f"{best['peak_rss_mb']:>9.0f}{best['requests']:>10}{best['mb_sent']:>9.1f}")
+    server.shutdown()
+
+    runs = {run["case"]: run for run in results}
+    if "sync" in runs and "fetch_layers" in runs:
+        sync, full = runs["sync"], runs["fetch_layers"]
+        print(f"sync vs full fetch: {sync['requests']} / {full['requests']} requests, "
+              f"{sync['mb_sent']:.2f} / {full['mb_sent']:.2f} MB sent")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            "features_per_layer": args.features, "latency": args.latency,
+            "max_record_count": args.max_record_count, "results": results,
+        }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
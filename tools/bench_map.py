@@ -0,0 +1,112 @@
+"""Measure map layer encodings: GeoJSON as folium embeds it vs quantized TopoJSON.
+
+Starts tools/mock_arcgis.py in-process, loads every LAYER_SOURCES layer
+into a scratch layer store through fetch_layers(), then for each layer in
+LAYER_META (at full resolution, or at every SIMPLIFY_BANDS tolerance with
+--bands) reports:
+
+    features        rows in the layer
+    GeoJSON / gz    bytes of the GeoJSON text, raw and gzipped
+    TopoJSON / gz   bytes of encode_topojson() (geometry only, as the map
+                    draws it), raw and gzipped
+    enc s           seconds to encode (gdf.to_json vs encode_topojson)
+    render s        seconds for folium to render a page holding just that
+                    layer (folium.GeoJson vs TopoJsonLayer)
+
+Decoding in the browser is not timed here; TopoJSON adds a topojson.feature()
+pass there, which is linear in the vertices like parsing the GeoJSON is.
+
+    python tools/bench_map.py --features 5000
+    python tools/bench_map.py --bands --json map.json
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from bench_fetch import APP, load_app  # noqa: E402
+from mock_arcgis import MockArcGIS, serve  # noqa: E402
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def measure(app, key, gdf, tolerance):
+    """One result row for layer ``key`` drawn at ``tolerance`` (None = full resolution)."""
+    import folium
+
+    if tolerance is not None:
+        gdf = gdf.set_geometry(gdf.geometry.simplify(tolerance, preserve_topology=True))
+    style = {"color": app.LAYER_META[key]["color"], "weight": 1}
+    geojson, geojson_s = _timed(lambda: gdf.to_json(drop_id=True))
+    topo, topo_s = _timed(lambda: app.encode_topojson(gdf, tolerance))
+
+    def render(layer):
+        fmap = folium.Map()
+        layer.add_to(fmap)
+        return fmap.get_root().render()
+
+    _, geojson_render = _timed(lambda: render(folium.GeoJson(gdf, style_function=lambda x: style)))
+    _, topo_render = _timed(lambda: render(app.TopoJsonLayer(topo, key, style)))
+    return {
+        "layer": key, "tolerance": tolerance, "features": len(gdf),
+        "geojson_bytes": len(geojson.encode()), "geojson_gz": len(gzip.compress(geojson.encode())),
+        "topojson_bytes": len(topo.encode()), "topojson_gz": len(gzip.compress(topo.encode())),
+        "geojson_encode_s": geojson_s, "topojson_encode_s": topo_s,
+        "geojson_render_s": geojson_render, "topojson_render_s": topo_render,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default=str(APP), help="path to app.py")
+    parser.add_argument("--features", type=int, default=5000, help="features per synthetic layer")
+    parser.add_argument("--bands", action="store_true", help="also measure every SIMPLIFY_BANDS tolerance")
+    parser.add_argument("--json", metavar="PATH", help="also write results as JSON")
+    args = parser.parse_args()
+
+    mock = MockArcGIS(features=args.features, latency=0.0)
+    server, url = serve(mock)
+    os.environ.update(TRTOOL_ARCGIS_ROOT=url, TRTOOL_CACHE_DIR=tempfile.mkdtemp(prefix="trtool-bench-"))
+    app = load_app(args.app)
+    if not app.TOPOJSON_AVAILABLE:
+        sys.exit("bench_map needs the topojson package: pip install topojson")
+    data, _ = app.fetch_layers()
+    server.shutdown()
+
+    tolerances = [None] + ([tol for _, tol in app.SIMPLIFY_BANDS] if args.bands else [])
+    header = (f"{'layer':<9}{'tolerance':>10}{'features':>9}{'GeoJSON':>10}{'gz':>9}"
+              f"{'TopoJSON':>10}{'gz':>9}{'size':>7}{'enc s':>12}{'render s':>14}")
+    print(header)
+    print("-" * len(header))
+    results = []
+    for key in app.LAYER_META:
+        gdf = data.get(key)
+        if gdf is None or gdf.empty:
+            print(f"{key:<9}{'no data':>10}")
+            continue
+        for tolerance in tolerances:
+            row = measure(app, key, gdf, tolerance)
+            results.append(row)
+            print(f"{key:<9}{tolerance or 'full':>10}{row['features']:>9}"
+                  f"{row['geojson_bytes'] / 1024:>9.0f}K{row['geojson_gz'] / 1024:>8.0f}K"
+                  f"{row['topojson_bytes'] / 1024:>9.0f}K{row['topojson_gz'] / 1024:>8.0f}K"
+                  f"{row['topojson_bytes'] / row['geojson_bytes']:>7.0%}"
+                  f"{row['geojson_encode_s']:>6.2f}/{row['topojson_encode_s']:<5.2f}"
+                  f"{row['geojson_render_s']:>8.2f}/{row['topojson_render_s']:<5.2f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"features_per_layer": args.features, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""Local stand-in for the ArcGIS REST services the app reads.
+
+Serves synthetic FeatureServer/MapServer layers at any path, so the fetch
+pipeline can be exercised and benchmarked without touching the live federal
+and state endpoints. Point the app at it with
+
+    python tools/mock_arcgis.py --port 8900 --features 20000 --latency 0.05
+    TRTOOL_ARCGIS_ROOT=http://127.0.0.1:8900 streamlit run app.py
+
+With TRTOOL_ARCGIS_ROOT set, ``https://<host>/<path>`` is requested as
+``<root>/<host>/<path>``, so every source keeps its own synthetic layer.
+
+Supported on ``.../query``: where (only the ``<field> > TIMESTAMP '...'``
+edit-date form is interpreted; anything else matches everything),
+outFields, objectIds, returnIdsOnly, returnCountOnly, resultOffset /
+resultRecordCount (capped at --max-record-count), geometry +
+esriSpatialRelIntersects (envelope, or a polygon's bounding box),
+geometryPrecision, f=json / geojson / pjson, GET and POST, gzip. The layer
+URL itself returns metadata with fields and editFieldsInfo.
+
+Standard library only, so it runs without the app's dependencies.
+"""
+
+import argparse
+import gzip
+import json
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Roughly statewide Oklahoma, so a CNO spatial filter has something to cut
+DEFAULT_EXTENT = (-103.0, 33.6, -94.4, 37.0)
+BASE_EDIT_MS = 1_700_000_000_000
+FIELDS = ["OBJECTID", "NAME", "STATUS", "COUNTY_NAME", "STATE_CODE", "LAT", "LONG", "EditDate"]
+STATUSES = ["Active", "Closed", "Under Review", "Remediated"]
+COUNTIES = ["Atoka", "Bryan", "Choctaw", "Coal", "Haskell", "Hughes", "Latimer",
+            "Le Flore", "McCurtain", "Pittsburg", "Pontotoc", "Pushmataha"]
+
+
+class SyntheticLayer:
+    """Deterministic features for one layer path."""
+
+    def __init__(self, path, size, kind, extent, seed):
+        self.path = path
+        self.kind = kind  # "point", "polygon" or "boundary"
+        rng = random.Random(f"{seed}:{path}")
+        xmin, ymin, xmax, ymax = extent
+        self.features = {}
+        count = 1 if kind == "boundary" else size
+        for oid in range(1, count + 1):
+            x = rng.uniform(xmin, xmax)
+            y = rng.uniform(ymin, ymax)
+            self.features[oid] = {
+                "OBJECTID": oid,
+                "NAME": f"Synthetic site {oid}",
+                "STATUS": rng.choice(STATUSES),
+                "COUNTY_NAME": rng.choice(COUNTIES),
+                "STATE_CODE": "OK",
+                "LAT": round(y, 6),
+                "LONG": round(x, 6),
+                "EditDate": BASE_EDIT_MS + rng.randrange(0, 86_400_000 * 365),
+                "_x": x,
+                "_y": y,
+                "_r": rng.uniform(0.005, 0.03),
+            }
+        self.lock = threading.Lock()
+
+    def ids(self):
+        return sorted(self.features)
+
+    def bbox(self, feat):
+        if self.kind == "boundary":
+            return (-96.9, 33.6, -94.45, 35.45)
+        if self.kind == "point":
+            return (feat["_x"], feat["_y"], feat["_x"], feat["_y"])
+        r = feat["_r"]
+        return (feat["_x"] - r, feat["_y"] - r, feat["_x"] + r, feat["_y"] + r)
+
+    def rings(self, feat, precision):
+        xmin, ymin, xmax, ymax = self.bbox(feat)
+        if self.kind == "boundary":
+            # A ragged outline with plenty of vertices, like a real boundary
+            cx, cy = (xmin + xmax) / 2, (ymin + ymax) / 2
+            pts = []
+            for i in range(720):
+                a = i / 720 * 2 * math.pi
+                wobble = 1 + 0.03 * ((i * 7919) % 13 - 6) / 6
+                pts.append((cx + (xmax - cx) * wobble * math.cos(a), cy + (ymax - cy) * wobble * math.sin(a)))
+            pts.append(pts[0])
+        else:
+            pts = [(xmin, ymin), (xmax, ymin), (xmax, ymax), (xmin, ymax), (xmin, ymin)]
+        return [[[_round(x, precision), _round(y, precision)] for x, y in pts]]
+
+    def mutate(self, added=0, deleted=0, edited=0):
+        """Simulate edits on the service (used by the bench_fetch.py sync case)."""
+        with self.lock:
+            rng = random.Random(len(self.features))
+            now_ms = int(time.time() * 1000)
+            ids = self.ids()
+            for oid in rng.sample(ids, min(deleted, len(ids))):
+                del self.features[oid]
+            for oid in rng.sample(self.ids(), min(edited, len(self.features))):
+                self.features[oid]["NAME"] += " (edited)"
+                self.features[oid]["EditDate"] = now_ms
+            next_id = (max(ids) if ids else 0) + 1
+            for oid in range(next_id, next_id + added):
+                base = dict(self.features[rng.choice(self.ids())]) if self.features else {}
+                base.update(OBJECTID=oid, NAME=f"Synthetic site {oid}", EditDate=now_ms)
+                self.features[oid] = base
+
+
+def _round(value, precision):
+    return value if precision is None else round(value, precision)
+
+
+class MockArcGIS:
+    """Configuration and layer registry shared by the request handlers."""
+
+    def __init__(self, features=5000, latency=0.0, jitter=0.0, fail_rate=0.0, error_rate=0.0,
+                 max_record_count=1000, extent=DEFAULT_EXTENT, point_patterns=("LandWeb", "Cleanups"),
+                 boundary_patterns=("AIANNHA",), sizes=None, seed=0):
+        self.features = features
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_rate = fail_rate
+        self.error_rate = error_rate
+        self.max_record_count = max_record_count
+        self.extent = extent
+        self.point_patterns = point_patterns
+        self.boundary_patterns = boundary_patterns
+        self.sizes = sizes or {}
+        self.seed = seed
+        self.layers = {}
+        self.requests = 0
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+
+    def layer(self, path):
+        path = path.rstrip("/")
+        with self.lock:
+            if path not in self.layers:
+                if any(p in path for p in self.boundary_patterns):
+                    kind = "boundary"
+                elif any(p in path for p in self.point_patterns):
+                    kind = "point"
+                else:
+                    kind = "polygon"
+                size = next((n for pattern, n in self.sizes.items() if pattern in path), self.features)
+                self.layers[path] = SyntheticLayer(path, size, kind, self.extent, self.seed)
+            return self.layers[path]
+
+
+def _parse_filter(params):
+    geom = params.get("geometry")
+    if not geom:
+        return None
+    try:
+        g = json.loads(geom)
+    except ValueError:
+        # Bare "xmin,ymin,xmax,ymax" envelopes are allowed too
+        return tuple(float(v) for v in geom.split(","))
+    if "rings" in g:
+        xs = [x for ring in g["rings"] for x, _ in ring]
+        ys = [y for ring in g["rings"] for _, y in ring]
+        return (min(xs), min(ys), max(xs), max(ys))
+    return (g["xmin"], g["ymin"], g["xmax"], g["ymax"])
+
+
+def _intersects(a, b):
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _matching_ids(layer, params):
+    ids = layer.ids()
+    if params.get("objectIds"):
+        wanted = {int(i) for i in params["objectIds"].split(",") if i.strip()}
+        ids = [i for i in ids if i in wanted]
+    m = re.search(r"(\w+)\s*>\s*TIMESTAMP\s*'([^']+)'", params.get("where", ""), re.I)
+    if m:
+        since = datetime.strptime(m.group(2), "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+        since_ms = since.timestamp() * 1000
+        ids = [i for i in ids if layer.features[i].get(m.group(1), 0) > since_ms]
+    bbox = _parse_filter(params)
+    if bbox is not None:
+        ids = [i for i in ids if _intersects(layer.bbox(layer.features[i]), bbox)]
+    return ids
+
+
+def _attributes(feat, out_fields):
+    if out_fields in ("*", "", None):
+        names = FIELDS
+    else:
+        names = [f.strip() for f in out_fields.split(",") if f.strip()]
+    return {n: _value(feat, n) for n in names}
+
+
+def _value(feat, name):
+    if name in feat:
+        return feat[name]
+    # Sources name their coordinate fields differently (LATDD3, LONDD3, ...)
+    upper = name.upper()
+    if upper.startswith("LAT"):
+        return feat["LAT"]
+    if upper.startswith("LON"):
+        return feat["LONG"]
+    # Unknown fields get synthetic text so any field profile can be exercised
+    return f"{name} {feat['OBJECTID']}"
+
+
+def query(layer, params, max_record_count):
+    ids = _matching_ids(layer, params)
+    if params.get("returnCountOnly") == "true":
+        return {"count": len(ids)}
+    if params.get("returnIdsOnly") == "true":
+        return {"objectIdFieldName": "OBJECTID", "objectIds": ids}
+    offset = int(params.get("resultOffset", 0) or 0)
+    count = min(int(params.get("resultRecordCount", max_record_count) or max_record_count), max_record_count)
+    page = ids[offset:offset + count]
+    exceeded = offset + count < len(ids)
+    precision = params.get("geometryPrecision")
+    precision = int(precision) if precision not in (None, "") else None
+    out_fields = params.get("outFields", "*")
+    feats = [layer.features[i] for i in page]
+    if params.get("f") == "geojson":
+        out = []
+        for feat in feats:
+            if layer.kind == "point":
+                geometry = {"type": "Point", "coordinates": [_round(feat["_x"], precision), _round(feat["_y"], precision)]}
+            else:
+                geometry = {"type": "Polygon", "coordinates": layer.rings(feat, precision)}
+            out.append({"type": "Feature", "id": feat["OBJECTID"], "geometry": geometry,
+                        "properties": _attributes(feat, out_fields)})
+        body = {"type": "FeatureCollection", "features": out}
+        if exceeded:
+            body["properties"] = {"exceededTransferLimit": True}
+        return body
+    out = []
+    for feat in feats:
+        if layer.kind == "point":
+            geometry = {"x": _round(feat["_x"], precision), "y": _round(feat["_y"], precision)}
+        else:
+            geometry = {"rings": layer.rings(feat, precision)}
+        out.append({"attributes": _attributes(feat, out_fields), "geometry": geometry})
+    return {"objectIdFieldName": "OBJECTID", "features": out, "exceededTransferLimit": exceeded}
+
+
+def layer_info(layer, max_record_count):
+    geometry_type = "esriGeometryPoint" if layer.kind == "point" else "esriGeometryPolygon"
+    return {
+        "name": layer.path.rsplit("/", 2)[0].rsplit("/", 1)[-1],
+        "geometryType": geometry_type,
+        "objectIdField": "OBJECTID",
+        "maxRecordCount": max_record_count,
+        "supportsPagination": True,
+        "editFieldsInfo": {"editDateField": "EditDate"},
+        "fields": [{"name": n} for n in FIELDS],
+    }
+
+
+def make_handler(mock):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _params(self):
+            parsed = urlparse(self.path)
+            params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+            if self.command == "POST":
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length).decode()
+                params.update({k: v[-1] for k, v in parse_qs(body).items()})
+            return parsed.path, params
+
+        def _send(self, status, body):
+            payload = json.dumps(body, separators=(",", ":")).encode()
+            headers = {"Content-Type": "application/json; charset=utf-8"}
+            accept = self.headers.get("Accept-Encoding", "")
+            if "gzip" in accept:
+                payload = gzip.compress(payload, compresslevel=5)
+                headers["Content-Encoding"] = "gzip"
+            elif "deflate" in accept:
+                payload = zlib.compress(payload)
+                headers["Content-Encoding"] = "deflate"
+            self.send_response(status)
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            with mock.lock:
+                mock.requests += 1
+                mock.bytes_sent += len(payload)
+
+        def do_POST(self):
+            self.do_GET()
+
+        def do_GET(self):
+            path, params = self._params()
+            if mock.latency or mock.jitter:
+                time.sleep(mock.latency + random.uniform(0, mock.jitter))
+            if mock.fail_rate and random.random() < mock.fail_rate:
+                self._send(503, {"error": {"code": 503, "message": "Injected failure"}})
+                return
+            if mock.error_rate and random.random() < mock.error_rate:
+                # ArcGIS style: HTTP 200 with an error body
+                self._send(200, {"error": {"code": 500, "message": "Injected ArcGIS error"}})
+                return
+            if path.rstrip("/").endswith("/query"):
+                layer = mock.layer(path.rstrip("/")[:-len("/query")])
+                self._send(200, query(layer, params, mock.max_record_count))
+            else:
+                self._send(200, layer_info(mock.layer(path), mock.max_record_count))
+
+    return Handler
+
+
+def serve(mock, host="127.0.0.1", port=0):
+    """Start the mock on a daemon thread; returns (server, base_url)."""
+    server = ThreadingHTTPServer((host, port), make_handler(mock))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-arcgis", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--features", type=int, default=5000, help="features per synthetic layer")
+    parser.add_argument("--size", action="append", default=[], metavar="PATTERN=N",
+                        help="layer size override for paths containing PATTERN (repeatable)")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency, up to this many seconds")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered with HTTP 503")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction answered with an ArcGIS error body")
+    parser.add_argument("--max-record-count", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sizes = dict((p, int(n)) for p, n in (s.split("=", 1) for s in args.size))
+    mock = MockArcGIS(features=args.features, latency=args.latency, jitter=args.jitter,
+                      fail_rate=args.fail_rate, error_rate=args.error_rate,
+                      max_record_count=args.max_record_count, sizes=sizes, seed=args.seed)
+    server, url = serve(mock, args.host, args.port)
+    print(f"Mock ArcGIS REST serving at {url}  (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()